@@ -3,6 +3,7 @@ from argparse import Action, ArgumentParser, FileType, Namespace
 from functools import wraps
 from inspect import Parameter, Signature, isclass, signature
 from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
+from weakref import WeakKeyDictionary
 
 from typing_extensions import Annotated, Self, get_args, get_origin, get_type_hints
 
@@ -253,12 +254,40 @@ def _is_valid_argparse_type(type_obj: Any) -> bool:
 
 _T_Parser = TypeVar("_T_Parser", bound=ArgumentParser)
 
+_SIGNATURE_CACHE: "WeakKeyDictionary[Callable, Signature]" = WeakKeyDictionary()
+
+
+def _get_signature(func: Callable) -> Signature:
+    """Get the signature of a callable, caching it per callable object.
+
+    Both parser construction and command invocation need the signature of the same
+    function; the cache makes sure it is only computed once. Entries go away together
+    with the function. Callables that cannot be cached are inspected directly.
+
+    :param func: The callable to inspect
+    :type func: Callable
+    :return: The signature of the callable
+    :rtype: Signature
+    """
+    try:
+        sig = _SIGNATURE_CACHE.get(func)
+    except TypeError:
+        return signature(func)
+    if sig is None:
+        sig = signature(func)
+        try:
+            _SIGNATURE_CACHE[func] = sig
+        except TypeError:  # pragma: no cover
+            pass
+    return sig
+
 
 def build_parser(
     func: Union[Callable, Signature],
     *,
     unannotated_mode: Literal["strict", "autoconvert", "ignore"] = "strict",
     parser_factory: Callable[[], _T_Parser] = ArgumentParser,
+    skip_first: bool = False,
 ) -> _T_Parser:
     """Construct an ArgumentParser from a function's signature and type annotations.
 
@@ -281,6 +310,8 @@ def build_parser(
     :type unannotated_mode: Literal["strict", "autoconvert", "ignore"]
     :param parser_factory: Custom factory for creating the parser instance
     :type parser_factory: Callable[..., _T_Parser]
+    :param skip_first: Skip the first parameter, e.g. ``self`` of an unbound method (default: False)
+    :type skip_first: bool
     :return: Fully configured ArgumentParser instance
     :rtype: _T_Parser
     :raises TypeError: For invalid parameter kinds or strict mode violations
@@ -304,10 +335,13 @@ def build_parser(
         type_hints = {}
     else:
         parser = parser_factory()
-        sig = signature(func)
+        sig = _get_signature(func)
         type_hints = get_type_hints(func, include_extras=True)
 
-    for param_name, param in sig.parameters.items():
+    params = tuple(sig.parameters.items())
+    if skip_first:
+        params = params[1:]
+    for param_name, param in params:
         annotation = type_hints.get(param_name, param.annotation)
         argument = get_argument(annotation)
         if argument is None:
@@ -341,14 +375,14 @@ def invoke_from_ns(func: Callable[..., _T], ns: Namespace) -> _T:
     :return: The result of the wrapped function
     :rtype: _T
     """
-    sig = signature(func)
+    sig = _get_signature(func)
     args, kwargs = [], {}
     for param_name, param in sig.parameters.items():
-        if param.kind == Parameter.VAR_POSITIONAL:
+        if param.kind is Parameter.VAR_POSITIONAL:
             args.extend(getattr(ns, param_name, []))
-        elif param.kind == Parameter.VAR_KEYWORD:
+        elif param.kind is Parameter.VAR_KEYWORD:
             kwargs.update(getattr(ns, param_name, {}))
-        elif param.kind == Parameter.KEYWORD_ONLY:
+        elif param.kind is Parameter.KEYWORD_ONLY:
             kwargs[param_name] = getattr(ns, param_name)
         else:
             args.append(getattr(ns, param_name))
@@ -6,8 +6,8 @@ with automatic argument parsing and completion.
 
 from ast import literal_eval
 from argparse import ArgumentParser, Namespace, _SubParsersAction
-from functools import partial, update_wrapper
-from types import MethodType
+from functools import partial
+from inspect import Parameter
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -17,6 +17,7 @@ from typing import (
     Literal,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -27,7 +28,7 @@ from typing import (
 from rich_argparse import RichHelpFormatter
 from typing_extensions import ParamSpec, Concatenate, Self
 
-from .argument import build_parser, invoke_from_ns
+from .argument import _get_signature, build_parser
 from .completer import ArgparseCompleter
 from .info import CommandInfo, CompleterGetterFunc, bind_parser
 
@@ -41,6 +42,8 @@ _P_Subcmd = ParamSpec("_P_Subcmd")
 _T = TypeVar("_T")
 _T_Subcmd = TypeVar("_T_Subcmd")
 
+_QUOTE_CHARS = ("'", '"')
+
 
 class Command(Generic[_P, _T]):
     """Wrapper class that adds command metadata and argument parsing to a function.
@@ -69,28 +72,56 @@ class Command(Generic[_P, _T]):
         disabled: bool = False,
         _parent: Optional["Command"] = None,
     ) -> None:
-        update_wrapper(self, func)
+        # Only the attributes used for introspection and help are copied; update_wrapper would
+        # also merge the function __dict__.
+        self.__module__ = getattr(func, "__module__", None)
+        self.__name__ = getattr(func, "__name__", "")
+        self.__qualname__ = getattr(func, "__qualname__", self.__name__)
+        self.__doc__ = getattr(func, "__doc__", None)
+        self.__annotations__ = getattr(func, "__annotations__", {})
+        self.__wrapped__ = func
         self._parent = _parent
         self.__func__ = func
+        # Resolve how namespace attributes map onto the function parameters once, so that
+        # invocation does not need to inspect the signature again. The first parameter
+        # receives the BaseCmd instance and is never filled from the namespace.
+        pos_names: List[str] = []
+        kw_names: List[str] = []
+        self._var_pos: Optional[str] = None
+        self._var_kw: Optional[str] = None
+        for param_name, param in tuple(_get_signature(func).parameters.items())[1:]:
+            if param.kind is Parameter.VAR_POSITIONAL:
+                self._var_pos = param_name
+            elif param.kind is Parameter.VAR_KEYWORD:
+                self._var_kw = param_name
+            elif param.kind is Parameter.KEYWORD_ONLY:
+                kw_names.append(param_name)
+            else:
+                pos_names.append(param_name)
+        self._pos_names: Tuple[str, ...] = tuple(pos_names)
+        self._kw_names: Tuple[str, ...] = tuple(kw_names)
         if parser is None:
             if parser_factory is None:
                 parser_factory = partial(
                     ArgumentParser, prog=func.__name__, description=func.__doc__, formatter_class=RichHelpFormatter
                 )
             parser = build_parser(
-                MethodType(self.__func__, object()),
+                self.__func__,
                 unannotated_mode=unannotated_mode,
                 parser_factory=parser_factory,
+                skip_first=True,
             )
             if cmd_name is not None:
                 parser.prog = cmd_name
         self.cmd_name = cmd_name
         self.parser = parser
-        self.parser.set_defaults(__cmd_ins__=self)
+        # Same as set_defaults(__cmd_ins__=self), minus the scan over actions for a matching dest
+        self.parser._defaults["__cmd_ins__"] = self
         self.help_category = help_category
         self.hidden = hidden
         self.disabled = disabled
         self._completer_getter = None
+        self._subparsers_action: Optional[_SubParsersAction] = None
 
     @overload
     def add_subcommand(
@@ -209,12 +240,15 @@ class Command(Generic[_P, _T]):
         """
         if parser is None:
             parser = self.parser
-        argv = [
-            literal_eval(arg)
-            if (arg.startswith('"') and arg.endswith('"')) or (arg.startswith("'") and arg.endswith("'"))
-            else arg
-            for arg in argv
-        ]
+        # Unquoting is only needed when a token starts with a quote, which is rare for
+        # typical command lines; skip rebuilding argv entirely in the common case.
+        for arg in argv:
+            if arg[:1] in _QUOTE_CHARS:
+                argv = [
+                    literal_eval(arg) if arg[:1] in _QUOTE_CHARS and arg[-1:] == arg[:1] else arg
+                    for arg in argv
+                ]
+                break
         try:
             ns = parser.parse_args(argv)
         except SystemExit:
@@ -234,33 +268,63 @@ class Command(Generic[_P, _T]):
         :rtype: Any
         """
         cmd_ins = getattr(ns, "__cmd_ins__", self)
+        if cmd_ins is self:
+            # Plain command without subcommands: no chain to walk.
+            ns.__cmd_chain__ = (self,)
+            ns.__cmd_result__ = None
+            return self._invoke_inner(cmd, ns)
+
         cmd_chain = [cmd_ins]
         while cmd_ins._parent is not None and cmd_ins is not self:
             cmd_ins = cmd_ins._parent
             cmd_chain.append(cmd_ins)
         assert cmd_ins is self, f"Command chain is broken(root={cmd_ins})"
 
-        ns.__cmd_chain__ = cmd_chain
+        ns.__cmd_chain__ = tuple(cmd_chain)
         ret = None
-        while cmd_chain:
-            cmd_ins = cmd_chain.pop()
+        # The chain is collected from the leaf upwards; run it from the root down.
+        for cmd_ins in reversed(cmd_chain):
             ns.__cmd_result__ = ret
-            ret = invoke_from_ns(MethodType(cmd_ins, cmd), ns)
+            ret = cmd_ins._invoke_inner(cmd, ns)
         return ret
 
+    def _invoke_inner(self, cmd: "BaseCmd", ns: Namespace) -> Any:
+        """Call the wrapped function of this command with arguments from a namespace.
+
+        :param cmd: The BaseCmd instance this command belongs to
+        :type cmd: "BaseCmd"
+        :param ns: The parsed argument namespace
+        :type ns: Namespace
+        :return: The result of the wrapped function
+        :rtype: Any
+        """
+        args = [getattr(ns, name) for name in self._pos_names]
+        if self._var_pos is not None:
+            args.extend(getattr(ns, self._var_pos, ()))
+        kwargs = {name: getattr(ns, name) for name in self._kw_names}
+        if self._var_kw is not None:
+            kwargs.update(getattr(ns, self._var_kw, {}))
+        return self.__func__(cmd, *args, **kwargs)
+
     def _ensure_subparsers(self) -> _SubParsersAction:
         """Ensure the command parser has a subparsers action.
 
         If the parser already has a subparsers action, return it.
-        Otherwise, create a new one and return it.
+        Otherwise, create a new one and return it. The action is cached on the
+        command, so the parser actions are only scanned once.
 
         :return: The subparsers action for this command
         :rtype: _SubParsersAction
         """
+        if self._subparsers_action is not None:
+            return self._subparsers_action
         for action in self.parser._actions:
             if isinstance(action, _SubParsersAction):
-                return action
-        return self.parser.add_subparsers(metavar='SUBCOMMAND', required=True)
+                break
+        else:
+            action = self.parser.add_subparsers(metavar='SUBCOMMAND', required=True)
+        self._subparsers_action = action
+        return action
 
     @overload
     def __get__(self, instance: None, owner: Optional[type]) -> Self: ...
@@ -422,16 +486,15 @@ def auto_argument(
     func: Union[Callable[_P, _T], str, None] = None,
     **kwds: Any
 ) -> Union[Command[_P, _T], Callable[[Callable[_P, _T]], Command[_P, _T]]]:
-    name = func if isinstance(func, str) else None
+    if isinstance(func, str):
+        if "cmd_name" in kwds:
+            raise TypeError("auto_argument() got multiple values for keyword argument 'cmd_name'")
+        kwds["cmd_name"] = func
 
     def inner(func: Callable[_P, _T]) -> Command[_P, _T]:
         if isinstance(func, Command):  # pragma: no cover
             raise TypeError("auto_argument cannot be used with Command instances directly")
-        return Command(
-            func,
-            cmd_name=name,
-            **kwds,
-        )
+        return Command(func, **kwds)
 
     if callable(func):
         return inner(func)
@@ -1,10 +1,27 @@
 import argparse
-import shlex
-from collections import deque
-from typing import Any, Dict, Generator, Iterable, List, Optional, Union
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
+from prompt_toolkit.formatted_text import FormattedText, to_formatted_text
 
 
 class PrefixCompleter(Completer):
@@ -80,6 +97,340 @@ class MultiPrefixCompleter(Completer):
                 yield from self.default.get_completions(document, complete_event)
 
 
+class _FlagSpec(NamedTuple):
+    """How the token walk treats a flag."""
+
+    action: argparse.Action
+    single_use: bool  # whether the flag is offered again after it was given
+    takes_values: bool
+
+
+class _ParserInfo(NamedTuple):
+    """Flag and positional tables extracted from an ArgumentParser for completion."""
+
+    flag_entries: List[Tuple[str, FormattedText, Optional[FormattedText]]]
+    sorted_flags: List[str]
+    sorted_flag_indexes: List[int]
+    abbrev_flags: List[str]
+    flag_specs: Dict[str, _FlagSpec]
+    positional_actions: List[argparse.Action]
+    subcommand_action: Optional[argparse._SubParsersAction]
+    subcommand_infos: Dict[str, Tuple[argparse.ArgumentParser, "_ParserInfo"]]
+    prefix_chars: FrozenSet[str]
+    negative_number_matcher: Optional[Pattern[str]]
+    has_negative_number_optionals: List[Any]
+    allow_abbrev: bool
+    actions: List[argparse.Action]  # the parser's own action list, to notice arguments added later
+    action_count: int
+
+
+_PARSER_INFO_CACHE: "WeakKeyDictionary[argparse.ArgumentParser, _ParserInfo]" = WeakKeyDictionary()
+
+
+def _build_info(parser: argparse.ArgumentParser) -> _ParserInfo:
+    """Extract the flag and positional tables of a parser.
+
+    :param parser: ArgumentParser instance
+    :type parser: argparse.ArgumentParser
+    :return: The extracted parser tables
+    :rtype: _ParserInfo
+    """
+    # flags offered for completion, with their display and display meta rendered once for all completions
+    flag_entries: List[Tuple[str, FormattedText, Optional[FormattedText]]] = []
+    flag_specs: Dict[str, _FlagSpec] = {}  # maps flags to their action and how it is walked
+    positional_actions: List[argparse.Action] = []  # actions for positional arguments
+    subcommand_action = None  # set if parser has subcommands
+
+    # Parse argparse actions
+    for action in parser._actions:
+        if action.option_strings:  # flag-based arguments
+            spec = _FlagSpec(
+                action,
+                not isinstance(action, (argparse._AppendAction, argparse._AppendConstAction, argparse._CountAction)),
+                _get_argument_spec(action).max > 0,  # type: ignore[operator]
+            )
+            for option in action.option_strings:
+                flag_specs[option] = spec
+                if action.help != argparse.SUPPRESS:
+                    flag_entries.append(
+                        (option, to_formatted_text(option), to_formatted_text(action.help) if action.help else None)
+                    )
+        else:  # positional arguments
+            positional_actions.append(action)
+            if isinstance(action, argparse._SubParsersAction):
+                subcommand_action = action
+    # flags in lexical order, for prefix lookups by bisection, with their original positions
+    sorted_flag_indexes = sorted(range(len(flag_entries)), key=lambda i: flag_entries[i][0])
+    sorted_flags = [flag_entries[i][0] for i in sorted_flag_indexes]
+    # abbreviations are resolved against every flag, including suppressed ones
+    abbrev_flags = sorted(flag_specs)
+    return _ParserInfo(
+        flag_entries,
+        sorted_flags,
+        sorted_flag_indexes,
+        abbrev_flags,
+        flag_specs,
+        positional_actions,
+        subcommand_action,
+        {},
+        frozenset(parser.prefix_chars),
+        getattr(parser, "_negative_number_matcher", None),
+        getattr(parser, "_has_negative_number_optionals", []),
+        parser.allow_abbrev,
+        parser._actions,
+        len(parser._actions),
+    )
+
+
+_Dependency = Tuple[Optional[argparse.Action], Any, int]
+
+
+def _dependencies_current(dependencies: Iterable[_Dependency]) -> bool:
+    """Check that cached completion data still matches the parsers it was computed from.
+
+    Each dependency is a container with its length at the time it was read, such as
+    the action list of a parser or the choices of an action. For choices, the owning
+    action is recorded too and must still return the same choices object. Lengths only
+    reveal containers that argparse grows (action lists, subcommand parsers), so choices
+    that can change in place are recorded with a length of -1 and never match.
+
+    :param dependencies: Dependencies as (owning action or None, container, length)
+    :type dependencies: Iterable[Tuple[Optional[argparse.Action], Any, int]]
+    :return: Whether none of the containers changed
+    :rtype: bool
+    """
+    for owner, container, length in dependencies:
+        if owner is not None and owner.choices is not container:
+            return False
+        if container is not None and (length < 0 or len(container) != length):
+            return False
+    return True
+
+
+def _get_subcommand_info(info: _ParserInfo, name: str) -> Optional[_ParserInfo]:
+    """Get the tables of a subcommand parser by name.
+
+    Resolved subcommands are remembered on the parent tables, so descending into a
+    subcommand is a single dict lookup once it has been completed before.
+
+    :param info: Tables of the parser with the subcommand action
+    :type info: _ParserInfo
+    :param name: Name of the subcommand
+    :type name: str
+    :return: The tables of the subcommand parser, or None if there is no such subcommand
+    :rtype: Optional[_ParserInfo]
+    """
+    entry = info.subcommand_infos.get(name)
+    if entry is None or entry[1].action_count != len(entry[0]._actions):
+        assert info.subcommand_action is not None
+        parser = info.subcommand_action.choices.get(name)
+        if parser is None:
+            return None
+        entry = info.subcommand_infos[name] = (parser, _get_parser_info(parser))
+    return entry[1]
+
+
+def _prefix_range(sorted_items: List[str], prefix: str) -> Tuple[int, int]:
+    """Find the slice of a sorted string list whose items start with a prefix.
+
+    :param sorted_items: Strings in lexical order
+    :type sorted_items: List[str]
+    :param prefix: The prefix to look up
+    :type prefix: str
+    :return: Start and end index of the matching strings
+    :rtype: Tuple[int, int]
+    """
+    return bisect_left(sorted_items, prefix), bisect_right(sorted_items, prefix + "\U0010ffff")
+
+
+def _unique_prefix_match(sorted_items: List[str], prefix: str) -> Optional[str]:
+    """Find the only string of a sorted list that starts with a prefix.
+
+    :param sorted_items: Strings in lexical order
+    :type sorted_items: List[str]
+    :param prefix: The prefix to look up
+    :type prefix: str
+    :return: The matching string, or None if there is no match or more than one
+    :rtype: Optional[str]
+    """
+    index = bisect_left(sorted_items, prefix)
+    if index == len(sorted_items) or not sorted_items[index].startswith(prefix):
+        return None
+    if index + 1 < len(sorted_items) and sorted_items[index + 1].startswith(prefix):
+        return None
+    return sorted_items[index]
+
+
+class _ChoiceTable(NamedTuple):
+    """String forms of the choices of an action, for prefix lookups."""
+
+    choices: Any
+    count: int
+    strs: List[str]
+    displays: List[FormattedText]  # rendered once, so completions need not convert their text again
+    sorted_strs: List[str]
+    sorted_indexes: List[int]
+
+
+_CHOICE_TABLE_CACHE: "WeakKeyDictionary[argparse.Action, _ChoiceTable]" = WeakKeyDictionary()
+
+# choices types whose contents cannot change, so the same object always has the same choices
+_IMMUTABLE_CHOICES = (tuple, frozenset, range, str)
+
+
+def _get_choice_table(action: argparse.Action, choices: Any) -> _ChoiceTable:
+    """Get the stringified choices of an action.
+
+    Only immutable choices (tuple, frozenset, range, str) and the parsers of a subcommand
+    action are cached. The table is rebuilt when the action returns a different choices
+    object or, for subcommands, when parsers were added. Other choices, such as lists
+    or objects computing their contents, are stringified again on every call with a
+    count of -1, so completions computed from them are never reused.
+
+    :param action: Action with choices
+    :type action: argparse.Action
+    :param choices: The current choices of the action
+    :type choices: Any
+    :return: The choice table
+    :rtype: _ChoiceTable
+    """
+    if type(choices) in _IMMUTABLE_CHOICES or isinstance(action, argparse._SubParsersAction):
+        count = len(choices)
+        table = _CHOICE_TABLE_CACHE.get(action)
+        if table is not None and table.choices is choices and table.count == count:
+            return table
+    else:
+        count = -1
+    strs = [str(choice) for choice in choices]
+    sorted_indexes = sorted(range(len(strs)), key=strs.__getitem__)
+    table = _ChoiceTable(
+        choices,
+        count,
+        strs,
+        [to_formatted_text(choice_str) for choice_str in strs],
+        [strs[i] for i in sorted_indexes],
+        sorted_indexes,
+    )
+    if count >= 0:
+        _CHOICE_TABLE_CACHE[action] = table
+    return table
+
+
+def _get_parser_info(parser: argparse.ArgumentParser) -> _ParserInfo:
+    """Get the tables of a parser, reusing them across completers of the same parser.
+
+    The tables are rebuilt when arguments have been added to the parser since they
+    were cached.
+
+    :param parser: ArgumentParser instance
+    :type parser: argparse.ArgumentParser
+    :return: The parser tables
+    :rtype: _ParserInfo
+    """
+    info = _PARSER_INFO_CACHE.get(parser)
+    if info is None or info.action_count != len(parser._actions):
+        info = _PARSER_INFO_CACHE[parser] = _build_info(parser)
+    return info
+
+
+# Tokens of a command line as non-POSIX shlex splits them: a quoted string up to its closing
+# quote (or the end of the line), or a run of non-whitespace that does not start with a quote
+_TOKEN_RE = re.compile(r"""["][^"]*["]?|['][^']*[']?|[^ \t\r\n"'][^ \t\r\n]*""")
+
+
+def _split_line(text: str, close_quotes: bool = True) -> List[str]:
+    """Split a command line the way ``shlex.split(text, posix=False)`` does.
+
+    Quoted tokens keep their quotes. An unclosed quote runs to the end of the text
+    and is closed, so a partially typed quoted argument still forms one token.
+
+    :param text: The command line text
+    :type text: str
+    :param close_quotes: Whether to close an unclosed quote instead of raising ValueError like shlex
+    :type close_quotes: bool
+    :return: The tokens of the line
+    :rtype: List[str]
+    :raises ValueError: If the last quote is not closed and ``close_quotes`` is false
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if tokens:
+        # only the last token can miss its closing quote, as an open quote runs to the end
+        last = tokens[-1]
+        quote = last[0]
+        if (quote == '"' or quote == "'") and (len(last) == 1 or last[-1] != quote):
+            if not close_quotes:
+                raise ValueError("No closing quotation")
+            tokens[-1] = last + quote
+    return tokens
+
+
+class _ArgumentSpec(NamedTuple):
+    """Value count limits and choice meta of an action."""
+
+    min: Union[int, str]
+    max: Union[float, int, str]
+    is_remainder: bool
+    choice_meta: FormattedText
+
+
+_ARGUMENT_SPEC_CACHE: "WeakKeyDictionary[argparse.Action, Tuple[Tuple[Any, Any, Any], _ArgumentSpec]]" = (
+    WeakKeyDictionary()
+)
+
+
+def _get_argument_spec(action: argparse.Action) -> _ArgumentSpec:
+    """Get how many values an action takes, computed once per action.
+
+    The spec is rebuilt when the nargs, metavar or help of the action were reassigned.
+
+    :param action: The argparse Action
+    :type action: argparse.Action
+    :return: The argument spec of the action
+    :rtype: _ArgumentSpec
+    """
+    key = (action.nargs, action.metavar, action.help)
+    entry = _ARGUMENT_SPEC_CACHE.get(action)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+
+    nargs_min: Union[int, str]
+    nargs_max: Union[float, int, str]
+    nargs_range = getattr(action, "get_nargs_range", lambda: None)()  # pragma: no cover
+    if nargs_range is not None:  # pragma: no cover
+        nargs_min, nargs_max = nargs_range
+    elif action.nargs is None:
+        nargs_min, nargs_max = 1, 1
+    elif action.nargs == argparse.OPTIONAL:
+        nargs_min, nargs_max = 0, 1
+    elif action.nargs in (argparse.ZERO_OR_MORE, argparse.REMAINDER):
+        nargs_min, nargs_max = 0, float("inf")
+    elif action.nargs == argparse.ONE_OR_MORE:
+        nargs_min, nargs_max = 1, float("inf")
+    else:
+        nargs_min = nargs_max = action.nargs
+    choice_meta = to_formatted_text(f"{action.metavar} - {action.help}" if action.help else f"{action.metavar}")
+    spec = _ArgumentSpec(nargs_min, nargs_max, action.nargs == argparse.REMAINDER, choice_meta)
+    _ARGUMENT_SPEC_CACHE[action] = (key, spec)
+    return spec
+
+
+class _PrewalkState(NamedTuple):
+    """Parse state reached after the tokens preceding the one being completed."""
+
+    info: _ParserInfo
+    pos_index: int
+    skip_remaining_flags: bool
+    pos_arg_state: Optional["ArgparseCompleter._ArgumentState"]
+    flag_arg_state: Optional["ArgparseCompleter._ArgumentState"]
+    matched_flags: FrozenSet[str]
+    consumed_arg_values: Dict[str, List[str]]
+
+
+_PREWALK_CACHE_SIZE = 8
+_RESULT_CACHE_SIZE = 4
+_MISSING: Any = object()
+
+
 class ArgparseCompleter(Completer):
     """
     Completer for argparse-based commands with advanced completion features.
@@ -96,40 +447,40 @@ class ArgparseCompleter(Completer):
         :type parser: argparse.ArgumentParser
         """
         self._parser = parser
-        self._flags: List[str] = []  # all flags in this command
-        self._flag_to_action: Dict[str, argparse.Action] = {}  # maps flags to the argparse action object
-        self._positional_actions: List[argparse.Action] = []  # actions for positional arguments
-        self._subcommand_action = None  # set if parser has subcommands
-
-        # Parse argparse actions
-        for action in self._parser._actions:
-            if action.option_strings:  # flag-based arguments
-                for option in action.option_strings:
-                    self._flags.append(option)
-                    self._flag_to_action[option] = action
-            else:  # positional arguments
-                self._positional_actions.append(action)
-                if isinstance(action, argparse._SubParsersAction):
-                    self._subcommand_action = action
+        # parse states of recent command lines, keyed by the tokens before the cursor,
+        # and completions of recent texts before the cursor, each with the parser
+        # containers they were computed from
+        self._prewalk_cache: "OrderedDict[Tuple[str, ...], Tuple[Optional[_PrewalkState], List[_Dependency]]]" = (
+            OrderedDict()
+        )
+        self._result_cache: "OrderedDict[str, Tuple[List[Completion], List[_Dependency]]]" = OrderedDict()
 
-    def get_completions(self, document: Document, complete_event: Any) -> Generator[Completion, None, None]:
-        """Generate completions as a generator for prompt_toolkit."""
+    @property
+    def _info(self) -> _ParserInfo:
+        """Flag and positional tables of the parser.
+
+        Looked up on use rather than in ``__init__``, so completers of commands that
+        are never completed interactively cost nothing beyond the instance itself.
+        """
+        return _get_parser_info(self._parser)
+
+    def get_completions(self, document: Document, complete_event: Any) -> Iterable[Completion]:
+        """Get the completions for prompt_toolkit.
+
+        The completions of the last few texts before the cursor are kept, so redraws
+        and repeated requests for the same text are answered without walking the line.
+        """
         text = document.text_before_cursor
+        cache = self._result_cache
+        entry = cache.get(text)
+        if entry is not None and _dependencies_current(entry[1]):
+            cache.move_to_end(text)
+            return entry[0]
+
         line = document.text
         cursor_position = document.cursor_position_col
 
-        # Tokenize using shlex
-        for quote in ("", '"', "'"):
-            # Handle incomplete quoting
-            try:
-                tokens = shlex.split(text + quote, comments=False, posix=False)
-            except ValueError:
-                continue
-            else:
-                break
-        else:  # pragma: no cover
-            # Revert to whitespace tokenization when shlex fails
-            tokens = text.split()
+        tokens = _split_line(text)
 
         # Check if cursor is at end of text with trailing space
         ends_with_space = text.endswith(" ")
@@ -144,13 +495,32 @@ class ArgparseCompleter(Completer):
         # Calculate start position for completions
         start_position = -len(text_to_complete)
 
-        # Yield completions directly from _get_completion_texts
-        yield from self._get_completion_texts(
-            text_to_complete, line, cursor_position - len(text_to_complete), cursor_position, tokens, start_position
+        dependencies: List[_Dependency] = []
+        completions = list(
+            self._get_completion_texts(
+                text_to_complete,
+                line,
+                cursor_position - len(text_to_complete),
+                cursor_position,
+                tokens,
+                start_position,
+                dependencies,
+            )
         )
+        cache[text] = (completions, dependencies)
+        if len(cache) > _RESULT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return completions
 
     def _get_completion_texts(
-        self, text: str, line: str, begidx: int, endidx: int, tokens: List[str], start_position: int
+        self,
+        text: str,
+        line: str,
+        begidx: int,
+        endidx: int,
+        tokens: List[str],
+        start_position: int,
+        dependencies: Optional[List[_Dependency]] = None,
     ) -> Generator[Completion, None, None]:
         """Generate completions by analyzing the command line state.
 
@@ -166,17 +536,107 @@ class ArgparseCompleter(Completer):
         :type tokens: List[str]
         :param start_position: Start position for completions
         :type start_position: int
+        :param dependencies: If given, collects the parser containers the completions were computed from
+        :type dependencies: Optional[List[Tuple[Optional[argparse.Action], Any, int]]]
         :return: Generator yielding Completion objects
         :rtype: Generator[Completion, None, None]
         """
-        remaining_positionals = deque(self._positional_actions)
-        skip_remaining_flags = False
-        pos_arg_state = None
-        flag_arg_state = None
-        matched_flags = []
-        consumed_arg_values: Dict[str, List[str]] = {}
-        # Parse all but last token
-        for token_index, token in enumerate(tokens[:-1]):
+        key = tuple(tokens[:-1])
+        cache = self._prewalk_cache
+        entry = cache.get(key)
+        if entry is not None and _dependencies_current(entry[1]):
+            cache.move_to_end(key)
+            state, walk_dependencies = entry
+        else:
+            walk_dependencies = []
+            # typing on after a finished token: extend the state of the line without it
+            resume = cache.get(key[:-1]) if key else None
+            if resume is None or not _dependencies_current(resume[1]):
+                state = self._prewalk(key, None, walk_dependencies)
+            else:
+                walk_dependencies.extend(resume[1])
+                state = None if resume[0] is None else self._prewalk(key, resume[0], walk_dependencies)
+            cache[key] = (state, walk_dependencies)
+            if len(cache) > _PREWALK_CACHE_SIZE:
+                cache.popitem(last=False)
+        if dependencies is not None:
+            dependencies.extend(walk_dependencies)
+        if state is None:
+            return
+        (
+            info,
+            pos_index,
+            skip_remaining_flags,
+            pos_arg_state,
+            flag_arg_state,
+            matched_flags,
+            consumed_arg_values,
+        ) = state
+
+        # Complete last token
+        if self._looks_like_flag(text, info) and not skip_remaining_flags:
+            if flag_arg_state and isinstance(flag_arg_state.min, int) and flag_arg_state.count < flag_arg_state.min:
+                return
+            yield from self._get_flag_completions(text, matched_flags, start_position, info)
+            return
+
+        if flag_arg_state:
+            yield from self._get_arg_completions(text, flag_arg_state, consumed_arg_values, start_position, dependencies)
+            return
+
+        has_remaining_positionals = pos_index < len(info.positional_actions)
+        if pos_arg_state or has_remaining_positionals:
+            if pos_arg_state is None and has_remaining_positionals:
+                pos_arg_state = self._ArgumentState(info.positional_actions[pos_index])
+            if pos_arg_state:
+                yield from self._get_arg_completions(text, pos_arg_state, consumed_arg_values, start_position, dependencies)
+            return
+
+        if not skip_remaining_flags and (self._single_prefix_char(text, info) or not has_remaining_positionals):
+            yield from self._get_flag_completions(text, matched_flags, start_position, info)
+
+    def _prewalk(
+        self,
+        tokens: Tuple[str, ...],
+        resume: Optional[_PrewalkState] = None,
+        dependencies: Optional[List[_Dependency]] = None,
+    ) -> Optional[_PrewalkState]:
+        """Replay the tokens before the one being completed through the parser.
+
+        :param tokens: All tokens but the last one
+        :type tokens: Tuple[str, ...]
+        :param resume: Cached state after all of the tokens but the last one, to continue from
+        :type resume: Optional[_PrewalkState]
+        :param dependencies: If given, collects the parser containers the walk read
+        :type dependencies: Optional[List[Tuple[Optional[argparse.Action], Any, int]]]
+        :return: The parse state after the tokens, or None if nothing can be completed
+        :rtype: Optional[_PrewalkState]
+        """
+        pos_arg_state: Optional[ArgparseCompleter._ArgumentState]
+        flag_arg_state: Optional[ArgparseCompleter._ArgumentState]
+        if dependencies is None:
+            dependencies = []
+        if resume is None:
+            start = 0
+            info = self._info
+            dependencies.append((None, info.actions, info.action_count))
+            pos_index = 0  # index of the next positional action to fill
+            skip_remaining_flags = False
+            pos_arg_state = None
+            flag_arg_state = None
+            matched_flags: Set[str] = set()
+            consumed_arg_values: Dict[str, List[str]] = {}
+        else:
+            # cached states are shared, so continue on copies of their mutable parts
+            start = len(tokens) - 1
+            info, pos_index, skip_remaining_flags, pos_arg_state, flag_arg_state = resume[:5]
+            pos_arg_state = pos_arg_state and pos_arg_state.copy()
+            flag_arg_state = flag_arg_state and flag_arg_state.copy()
+            matched_flags = set(resume.matched_flags)
+            consumed_arg_values = {dest: values.copy() for dest, values in resume.consumed_arg_values.items()}
+        positional_actions = info.positional_actions
+
+        for token in tokens[start:]:
             if pos_arg_state and pos_arg_state.is_remainder:
                 self._consume_argument(pos_arg_state, token, consumed_arg_values)
                 continue
@@ -190,33 +650,29 @@ class ArgparseCompleter(Completer):
 
             elif token == "--" and not skip_remaining_flags:
                 if flag_arg_state and isinstance(flag_arg_state.min, int) and flag_arg_state.count < flag_arg_state.min:
-                    return
+                    return None
                 flag_arg_state = None
                 skip_remaining_flags = True
                 continue
 
-            if self._looks_like_flag(token) and not skip_remaining_flags:
+            if self._looks_like_flag(token, info) and not skip_remaining_flags:
                 if flag_arg_state and isinstance(flag_arg_state.min, int) and flag_arg_state.count < flag_arg_state.min:
-                    return
+                    return None
 
                 flag_arg_state = None
-                action = None
-
-                if token in self._flag_to_action:
-                    action = self._flag_to_action[token]
-                elif self._parser.allow_abbrev:
-                    candidates = [f for f in self._flag_to_action if f.startswith(token)]
-                    if len(candidates) == 1:
-                        action = self._flag_to_action[candidates[0]]
-
-                if action:
-                    if not isinstance(action, (argparse._AppendAction, argparse._AppendConstAction, argparse._CountAction)):
-                        matched_flags.extend(action.option_strings)
-                        consumed_arg_values[action.dest] = []
-
-                    new_arg_state = self._ArgumentState(action)
-                    if new_arg_state.max > 0:  # type: ignore[operator]
-                        flag_arg_state = new_arg_state
+                flag_spec = info.flag_specs.get(token)
+                if flag_spec is None and info.allow_abbrev and len(token) > 1:  # argparse never expands a lone prefix char
+                    flag = _unique_prefix_match(info.abbrev_flags, token)
+                    if flag is not None:
+                        flag_spec = info.flag_specs[flag]
+
+                if flag_spec is not None:
+                    if flag_spec.single_use:
+                        matched_flags.update(flag_spec.action.option_strings)
+                        consumed_arg_values[flag_spec.action.dest] = []
+
+                    if flag_spec.takes_values:
+                        flag_arg_state = self._ArgumentState(flag_spec.action)
                         skip_remaining_flags = flag_arg_state.is_remainder
 
             elif flag_arg_state:
@@ -225,17 +681,23 @@ class ArgparseCompleter(Completer):
                     flag_arg_state = None
 
             else:
-                if pos_arg_state is None and remaining_positionals:
-                    action = remaining_positionals.popleft()
-                    if action == self._subcommand_action:
-                        assert self._subcommand_action is not None
-                        if token in self._subcommand_action.choices:
-                            parser = self._subcommand_action.choices[token]
-                            completer = ArgparseCompleter(parser)
-                            yield from completer._get_completion_texts(
-                                text, line, begidx, endidx, tokens[token_index + 1 :], start_position
-                            )
-                        return
+                if pos_arg_state is None and pos_index < len(positional_actions):
+                    action = positional_actions[pos_index]
+                    pos_index += 1
+                    if action is info.subcommand_action:
+                        choices = action.choices
+                        dependencies.append((None, choices, len(choices)))  # type: ignore[arg-type]
+                        subcommand_info = _get_subcommand_info(info, token)
+                        if subcommand_info is None:
+                            return None
+                        dependencies.append((None, subcommand_info.actions, subcommand_info.action_count))
+                        # continue the walk with the subcommand's parser in place
+                        info = subcommand_info
+                        positional_actions = info.positional_actions
+                        pos_index = 0
+                        skip_remaining_flags = False
+                        matched_flags = set()
+                        consumed_arg_values = {}
                     else:
                         pos_arg_state = self._ArgumentState(action)
 
@@ -245,43 +707,35 @@ class ArgparseCompleter(Completer):
                         skip_remaining_flags = True
                     elif isinstance(pos_arg_state.max, (float, int)) and pos_arg_state.count >= pos_arg_state.max:
                         pos_arg_state = None
-                        if remaining_positionals and remaining_positionals[0].nargs == argparse.REMAINDER:
+                        if (
+                            pos_index < len(positional_actions)
+                            and positional_actions[pos_index].nargs == argparse.REMAINDER
+                        ):
                             skip_remaining_flags = True
 
-        # Complete last token
-        if self._looks_like_flag(text) and not skip_remaining_flags:
-            if flag_arg_state and isinstance(flag_arg_state.min, int) and flag_arg_state.count < flag_arg_state.min:
-                return
-            yield from self._get_flag_completions(text, matched_flags, start_position)
-            return
-
-        if flag_arg_state:
-            yield from self._get_arg_completions(text, flag_arg_state, consumed_arg_values, start_position)
-            return
-
-        elif pos_arg_state or remaining_positionals:
-            if pos_arg_state is None and remaining_positionals:
-                action = remaining_positionals.popleft()
-                pos_arg_state = self._ArgumentState(action)
-            if pos_arg_state:
-                yield from self._get_arg_completions(text, pos_arg_state, consumed_arg_values, start_position)
-            return
-
-        if not skip_remaining_flags and (self._single_prefix_char(text) or not remaining_positionals):
-            yield from self._get_flag_completions(text, matched_flags, start_position)
+        return _PrewalkState(
+            info,
+            pos_index,
+            skip_remaining_flags,
+            pos_arg_state,
+            flag_arg_state,
+            frozenset(matched_flags),
+            consumed_arg_values,
+        )
 
     def _get_flag_completions(
-        self, text: str, matched_flags: List[str], start_position: int
+        self, text: str, matched_flags: AbstractSet[str], start_position: int, info: Optional[_ParserInfo] = None
     ) -> Generator[Completion, None, None]:
         """Yield unused flags that match the text."""
-        for flag in self._flags:
+        if info is None:
+            info = self._info
+        lo, hi = _prefix_range(info.sorted_flags, text)
+        # yield matches in declaration order rather than lexical order
+        for index in sorted(info.sorted_flag_indexes[lo:hi]):
+            flag, display, display_meta = info.flag_entries[index]
             if flag in matched_flags:
                 continue
-            action = self._flag_to_action[flag]
-            if action.help != argparse.SUPPRESS and flag.startswith(text):
-                yield Completion(
-                    text=flag, start_position=start_position, display=flag, display_meta=action.help if action.help else None
-                )
+            yield Completion(text=flag, start_position=start_position, display=display, display_meta=display_meta)
 
     def _get_arg_completions(
         self,
@@ -289,49 +743,57 @@ class ArgparseCompleter(Completer):
         arg_state: "_ArgumentState",
         consumed_arg_values: Dict[str, List[str]],
         start_position: int,
+        dependencies: Optional[List[_Dependency]] = None,
     ) -> Generator[Completion, None, None]:
         """Yield argument value completions."""
-        if arg_state.action.choices is None:
+        choices = arg_state.action.choices
+        if choices is None:
+            if dependencies is not None:
+                dependencies.append((arg_state.action, None, 0))
             return
-        used_values = consumed_arg_values.get(arg_state.action.dest, [])
-        for choice in arg_state.action.choices:
-            choice_str = str(choice)
-            if not choice_str.startswith(text) or choice_str in used_values:
+        table = _get_choice_table(arg_state.action, choices)
+        if dependencies is not None:
+            dependencies.append((arg_state.action, choices, table.count))
+        used_values = frozenset(consumed_arg_values.get(arg_state.action.dest, ()))
+        display_meta = arg_state.choice_meta
+        lo, hi = _prefix_range(table.sorted_strs, text)
+        # yield matches in the order of the choices rather than lexical order
+        for index in sorted(table.sorted_indexes[lo:hi]):
+            choice_str = table.strs[index]
+            if choice_str in used_values:
                 continue
             yield Completion(
                 text=choice_str,
                 start_position=start_position,
-                display=choice_str,
-                display_meta=(
-                    f"{arg_state.action.metavar} - {arg_state.action.help}"
-                    if arg_state.action.help
-                    else f"{arg_state.action.metavar}"
-                ),
+                display=table.displays[index],
+                display_meta=display_meta,
             )
 
-    def _looks_like_flag(self, token: str) -> bool:
+    def _looks_like_flag(self, token: str, info: Optional[_ParserInfo] = None) -> bool:
         """Check if token looks like a flag."""
-        if len(token) < 1:
-            return False
-        if token[0] not in self._parser.prefix_chars:
+        if info is None:
+            info = self._info
+        if not token or token[0] not in info.prefix_chars:
             return False
-        if hasattr(self._parser, "_negative_number_matcher"):
-            if self._parser._negative_number_matcher.match(token):
-                if not getattr(self._parser, "_has_negative_number_optionals", False):
-                    return False
-        if " " in token:
+        matcher = info.negative_number_matcher
+        if matcher is not None and not info.has_negative_number_optionals and matcher.match(token):
             return False
-        return True
+        return " " not in token
 
-    def _single_prefix_char(self, token: str) -> bool:
+    def _single_prefix_char(self, token: str, info: Optional[_ParserInfo] = None) -> bool:
         """Check if token is just a single flag prefix char."""
-        return len(token) == 1 and token[0] in self._parser.prefix_chars
+        if info is None:
+            info = self._info
+        return len(token) == 1 and token in info.prefix_chars
 
     def _consume_argument(self, arg_state: "_ArgumentState", token: str, consumed_arg_values: Dict[str, List[str]]) -> None:
         """Record consumption of an argument value."""
         arg_state.count += 1
-        consumed_arg_values.setdefault(arg_state.action.dest, [])
-        consumed_arg_values[arg_state.action.dest].append(token)
+        values = consumed_arg_values.get(arg_state.action.dest)
+        if values is None:
+            consumed_arg_values[arg_state.action.dest] = [token]
+        else:
+            values.append(token)
 
     class _ArgumentState:
         """Track state of an argument being parsed.
@@ -349,25 +811,21 @@ class ArgparseCompleter(Completer):
         :vartype count: int
         :ivar is_remainder: Whether this is a remainder argument
         :vartype is_remainder: bool
+        :ivar choice_meta: Display meta shown next to each choice of the argument
+        :vartype choice_meta: FormattedText
         """
 
+        __slots__ = ["action", "min", "max", "count", "is_remainder", "choice_meta"]
+
         def __init__(self, arg_action: argparse.Action) -> None:
             self.action = arg_action
             self.min: Union[int, str]
             self.max: Union[float, int, str]
             self.count = 0
-            self.is_remainder = self.action.nargs == argparse.REMAINDER
-
-            nargs_range = getattr(self.action, "get_nargs_range", lambda: None)()  # pragma: no cover
-            if nargs_range is not None:  # pragma: no cover
-                self.min, self.max = nargs_range
-            elif self.action.nargs is None:
-                self.min, self.max = 1, 1
-            elif self.action.nargs == argparse.OPTIONAL:
-                self.min, self.max = 0, 1
-            elif self.action.nargs in (argparse.ZERO_OR_MORE, argparse.REMAINDER):
-                self.min, self.max = 0, float("inf")
-            elif self.action.nargs == argparse.ONE_OR_MORE:
-                self.min, self.max = 1, float("inf")
-            else:
-                self.min = self.max = self.action.nargs
+            self.min, self.max, self.is_remainder, self.choice_meta = _get_argument_spec(arg_action)
+
+        def copy(self) -> "ArgparseCompleter._ArgumentState":
+            """Create a copy of this state with the same consumed value count."""
+            state = ArgparseCompleter._ArgumentState(self.action)
+            state.count = self.count
+            return state
@@ -1,20 +1,22 @@
 import asyncio
 from contextlib import suppress
-import pydoc
-import shlex
 import signal
 import sys
 import warnings
 from abc import ABCMeta
 from argparse import _StoreAction
 from asyncio import iscoroutine
-from collections import defaultdict
+from collections import defaultdict, deque
+from types import CoroutineType
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
+    Iterable,
     List,
     Optional,
     Sequence,
@@ -29,27 +31,51 @@ from typing import (
 from prompt_toolkit.completion import Completer, NestedCompleter
 from prompt_toolkit.formatted_text import ANSI, is_formatted_text
 from prompt_toolkit.input import Input, create_input
-from prompt_toolkit.lexers import PygmentsLexer
 from prompt_toolkit.output import Output, create_output
 from prompt_toolkit.patch_stdout import StdoutProxy
 from prompt_toolkit.shortcuts.prompt import CompleteStyle, PromptSession
-from pygments.lexers.shell import BashLexer
-from rich.columns import Columns
-from rich.console import Console
 from rich.text import Text
-from rich.panel import Panel
 from rich.style import Style
 from rich.theme import Theme
 
 from .argument import Arg
 from .command import auto_argument
-from .completer import MultiPrefixCompleter
+from .completer import MultiPrefixCompleter, _split_line
 from .info import CommandInfo, CommandLike, build_cmd_info, set_info, get_cmd_ins
 from .theme import DEFAULT as THEME
 
+if TYPE_CHECKING:
+    from prompt_toolkit.lexers import Lexer
+    from rich.columns import Columns
+    from rich.console import Console
+    from rich.panel import Panel
+
 
 _T = TypeVar("_T")
 
+# Line handed to the hooks when input ends. Kept a str, so hooks still receive strings and
+# typing "EOF" behaves the same.
+_EOF = "EOF"
+
+_bash_lexer: Optional["Lexer"] = None
+
+
+def _get_bash_lexer() -> "Lexer":
+    """Get the lexer highlighting the command line, shared by all prompts.
+
+    Created on first use, since it is only needed for interactive sessions.
+
+    :return: Pygments Bash lexer for prompt_toolkit
+    :rtype: Lexer
+    """
+    global _bash_lexer
+    if _bash_lexer is None:
+        from prompt_toolkit.lexers import PygmentsLexer
+        from pygments.lexers.shell import BashLexer
+
+        _bash_lexer = PygmentsLexer(BashLexer)
+    return _bash_lexer
+
 
 async def _ensure_coroutine(coro: Union[Coroutine[Any, Any, _T], _T]) -> _T:
     """Ensure the input is awaited if it's a coroutine, otherwise return as-is.
@@ -86,7 +112,10 @@ class BaseCmd(object, metaclass=ABCMeta):
         "raw_stdout",
         "theme",
         "prompt",
-        "shortcuts",
+        "_prompt_cache_key",
+        "_prompt_cache_val",
+        "_shortcuts",
+        "_shortcut_index",
         "intro",
         "doc_leader",
         "doc_header",
@@ -95,9 +124,12 @@ class BaseCmd(object, metaclass=ABCMeta):
         "nohelp",
         "cmdqueue",
         "session",
-        "console",
+        "_console",
         "lastcmd",
-        "command_info",
+        "_command_info",
+        "_visible_info_cache",
+        "_visible_version",
+        "_completer",
         "default_category",
         "complete_style",
     ]
@@ -118,7 +150,7 @@ class BaseCmd(object, metaclass=ABCMeta):
         stdout: Optional[TextIO] = None,
         *,
         session: Optional[Union[PromptSession, Callable[[Input, Output], PromptSession]]] = None,
-        console: Optional[Console] = None,
+        console: Optional["Console"] = None,
         theme: Optional[Theme] = None,
         prompt: Any = None,
         shortcuts: Optional[Dict[str, str]] = None,
@@ -156,6 +188,13 @@ class BaseCmd(object, metaclass=ABCMeta):
         else:
             self.raw_stdout = sys.stdout
 
+        self._completer: Optional[Completer] = None
+        self._visible_info_cache: Optional[List[CommandInfo]] = None
+        # bumped whenever the visible commands may have changed, for caches derived from them
+        self._visible_version = 0
+        # the last prompt object rendered, with its rendered text and the form passed to the session
+        self._prompt_cache_key: Any = None
+        self._prompt_cache_val: Optional[Tuple[Any, Any]] = None
         self.theme = theme or self.DEFAULT_THEME
         self.prompt = prompt or self.DEFAULT_PROMPT
         self.shortcuts = shortcuts or self.DEFAULT_SHORTCUTS
@@ -176,26 +215,34 @@ class BaseCmd(object, metaclass=ABCMeta):
         else:
             self.stdout = self.raw_stdout
             self.session = session if isinstance(session, PromptSession) else None
-        self.console = console or Console(file=self.stdout, theme=self.theme)
+        self._console = console
 
-        self.cmdqueue = []
+        # a list may be assigned as with cmd.Cmd; the default deque pops from the front cheaply
+        self.cmdqueue: Union[Deque[str], List[str]] = deque()
         self.lastcmd = ""
-        self.command_info  = {}
-        for info in map(self._build_command_info, self.__commands__):
-            if info.name in self.command_info:
+        command_info: Dict[str, CommandInfo] = {}
+        for cmd in self.__commands__:
+            info = build_cmd_info(cmd, self)
+            if info.name in command_info:
                 raise ValueError(f"Duplicate command name: {info.name}")
-            self.command_info[info.name] = info
+            command_info[info.name] = info
+        self.command_info = command_info
 
     def cmdloop(self, intro: Optional[Any] = None) -> None:
         """Start the command loop for synchronous execution.
 
         This is the main entry point for running the command processor.
-        It wraps the async cmdloop_async() method in an asyncio.run() call.
+        It wraps the async cmdloop_async() method in an asyncio.run() call,
+        or in uvloop.run() when uvloop is installed.
 
         :param intro: Optional introductory message to display at startup
         :type intro: Optional[Any]
         """
-        return asyncio.run(self.cmdloop_async(intro))
+        try:
+            from uvloop import run
+        except ImportError:
+            run = asyncio.run
+        return run(self.cmdloop_async(intro))
 
     async def cmdloop_async(self, intro: Optional[Any] = None) -> None:
         """Asynchronous command loop that processes user input.
@@ -211,18 +258,24 @@ class BaseCmd(object, metaclass=ABCMeta):
                 self.console.print(self.intro)
             stop = None
             while not stop:
-                if self.cmdqueue:
-                    line = self.cmdqueue.pop(0)
+                cmdqueue = self.cmdqueue
+                if cmdqueue:
+                    line = cmdqueue.popleft() if isinstance(cmdqueue, deque) else cmdqueue.pop(0)
                 else:
                     try:
                         line = await self.input_line()
                     except KeyboardInterrupt:  # pragma: no cover
                         continue
                     except EOFError:
-                        line = "EOF"
-                line = await _ensure_coroutine(self.precmd(line))
+                        line = _EOF
+                # hooks are usually synchronous, so only await results that are coroutines
+                line = self.precmd(line)
+                if type(line) is CoroutineType:
+                    line = await line
                 stop = await self.onecmd(line)
-                stop = await _ensure_coroutine(self.postcmd(stop, line))
+                stop = self.postcmd(stop, line)
+                if type(stop) is CoroutineType:
+                    stop = await stop
         finally:
             await _ensure_coroutine(self.postloop())
 
@@ -278,19 +331,16 @@ class BaseCmd(object, metaclass=ABCMeta):
         :return: The input line from the user
         :rtype: str
         """
-        if self.session is None:
-            loop = asyncio.get_running_loop()
-            line = await loop.run_in_executor(None, self.stdin.readline)
+        session = self.session
+        if session is None:
+            line = await asyncio.get_running_loop().run_in_executor(None, self.stdin.readline)
             if not line:
                 raise EOFError
             return line.rstrip("\r\n")
-        prompt = self._render_rich_text(self.prompt)
-        if isinstance(prompt, str):
-            prompt = ANSI(prompt)
-        return await self.session.prompt_async(
-            prompt,
+        return await session.prompt_async(
+            self._render_prompt()[1],
             completer=self.completer,
-            lexer=PygmentsLexer(BashLexer),
+            lexer=_get_bash_lexer(),
             complete_in_thread=True,
             complete_style=self.complete_style,
         )
@@ -315,12 +365,13 @@ class BaseCmd(object, metaclass=ABCMeta):
         line = line.strip()
         if not line:
             return None, None, line
-        for shortcut, cmd_name in self.shortcuts.items():
+        for shortcut, cmd_name in self._shortcut_index.get(line[0], ()):
             if line.startswith(shortcut):
                 if cmd_name not in self.command_info:
                     return None, None, line
                 line = f"{cmd_name} {line[len(shortcut) :]}"
-        tokens = shlex.split(line, comments=False, posix=False)
+                break
+        tokens = _split_line(line, close_quotes=False)
         return tokens[0], tokens[1:], line
 
     async def onecmd(self, line: str) -> Optional[bool]:
@@ -331,26 +382,34 @@ class BaseCmd(object, metaclass=ABCMeta):
         :return: Boolean to stop command loop (True) or continue (False/None)
         :rtype: Optional[bool]
         """
-        cmd, arg, _line = await _ensure_coroutine(self.parseline(line))
+        parsed = self.parseline(line)
+        if type(parsed) is CoroutineType:
+            parsed = await parsed
+        cmd, arg, _line = parsed
         if not _line:
-            return await _ensure_coroutine(self.emptyline())
+            stop = self.emptyline()
+            return await stop if type(stop) is CoroutineType else stop
         if not cmd:
-            return await _ensure_coroutine(self.default(_line))
-        if line != "EOF":
+            stop = self.default(_line)
+            return await stop if type(stop) is CoroutineType else stop
+        if line != _EOF:
             self.lastcmd = line
 
         info = self.command_info.get(cmd)
         if info is None or info.disabled:
-            return await _ensure_coroutine(self.default(line))
+            stop = self.default(line)
+            return await stop if type(stop) is CoroutineType else stop
         assert arg is not None
         try:
-            result = await _ensure_coroutine(info.cmd_func(arg))
+            result = info.cmd_func(arg)
+            if type(result) is CoroutineType:
+                result = await result
         except (Exception, SystemExit):
             self.pexcept()
             return
         except KeyboardInterrupt:  # pragma: no cover
             return
-        return bool(result) if result is not None else None
+        return None if result is None else bool(result)
 
     async def emptyline(self) -> Optional[bool]:
         """Handle empty line input.
@@ -373,7 +432,7 @@ class BaseCmd(object, metaclass=ABCMeta):
         :param line: The unknown command line that was entered
         :type line: str
         """
-        if line == "EOF":
+        if line == _EOF:
             return True
         self.perror(f"Unknown command: {line}")
 
@@ -388,20 +447,42 @@ class BaseCmd(object, metaclass=ABCMeta):
     def get_visible_command_info(self) -> List[CommandInfo]:
         """Get a list of all registered commands that are visible and enabled.
 
-        :return: List of visible command info objects
+        The filtered commands are cached until :meth:`invalidate_visible_info` is called.
+
+        :return: List of visible command info objects, sorted by name
         :rtype: List[CommandInfo]
         """
-        return [info for info in self.command_info.values() if not info.hidden and not info.disabled]
+        return list(self._get_visible_info())
 
     def get_visible_commands(self) -> List[str]:
         """Get a list of commands that are visible and enabled.
 
         Filters out commands marked as hidden or disabled.
 
-        :return: List of visible command names
+        :return: List of visible command names, sorted
         :rtype: List[str]
         """
-        return [info.name for info in self.get_visible_command_info()]
+        return [info.name for info in self._get_visible_info()]
+
+    def invalidate_visible_info(self) -> None:
+        """Drop the cached visible commands and the completer built from them.
+
+        Must be called after commands are added, removed, hidden, shown, enabled or
+        disabled by changing :attr:`command_info` in place.
+        """
+        self._visible_info_cache = None
+        self._visible_version += 1
+        self.invalidate_completer()
+
+    def _get_visible_info(self) -> List[CommandInfo]:
+        visible = self._visible_info_cache
+        if visible is None:
+            # sorted by name once here, so the help sections built from it need no sorting
+            visible = self._visible_info_cache = sorted(
+                (info for info in self.command_info.values() if not info.hidden and not info.disabled),
+                key=lambda info: info.name,
+            )
+        return visible
 
     @property
     def visible_prompt(self) -> str:
@@ -413,11 +494,94 @@ class BaseCmd(object, metaclass=ABCMeta):
         :return: prompt stripped of any ANSI escape codes
         :rtype: str
         """
-        return ANSI(self._render_rich_text(self.prompt)).value
+        return ANSI(self._render_prompt()[0]).value
+
+    @property
+    def command_info(self) -> Dict[str, CommandInfo]:
+        """Information of the registered commands, keyed by command name.
+
+        Assigning a new mapping resets the cached visible commands and completer. After
+        changing the mapping in place, e.g. to enable or disable a command, call
+        :meth:`invalidate_visible_info`.
+
+        :return: Mapping of command names to command info objects
+        :rtype: Dict[str, CommandInfo]
+        """
+        return self._command_info
+
+    @command_info.setter
+    def command_info(self, command_info: Dict[str, CommandInfo]) -> None:
+        self._command_info = command_info
+        self.invalidate_visible_info()
+
+    @property
+    def shortcuts(self) -> Dict[str, str]:
+        """Command shortcut mappings, e.g. ``{"?": "help"}``.
+
+        Assign a new mapping rather than changing it in place, so that the shortcut
+        lookup table and the cached completer are rebuilt.
+
+        :return: Mapping of shortcut prefixes to command names
+        :rtype: Dict[str, str]
+        """
+        return self._shortcuts
+
+    @shortcuts.setter
+    def shortcuts(self, shortcuts: Dict[str, str]) -> None:
+        self._shortcuts = shortcuts
+        # shortcuts grouped by their first character, so parseline only tries those that can match
+        shortcut_index: Dict[str, List[Tuple[str, str]]] = {}
+        # longest first, so that a shortcut never hides a longer one starting with it
+        for shortcut, cmd_name in sorted(shortcuts.items(), key=lambda item: len(item[0]), reverse=True):
+            shortcut_index.setdefault(shortcut[:1], []).append((shortcut, cmd_name))
+        self._shortcut_index = shortcut_index
+        self.invalidate_completer()
+
+    @property
+    def console(self) -> "Console":
+        """Rich console printing to :attr:`stdout`.
+
+        Created on first use unless one was passed to the constructor.
+
+        :return: Console used for all output
+        :rtype: Console
+        """
+        console = self._console
+        if console is None:
+            from rich.console import Console
+
+            console = self._console = Console(file=self.stdout, theme=self.theme)
+        return console
+
+    @console.setter
+    def console(self, console: "Console") -> None:
+        self._console = console
 
     @property
     def completer(self) -> Completer:
-        cmd_completer_options = {info.name: info.completer for info in self.get_visible_command_info()}
+        """Completer for the command line.
+
+        Built on first use and reused for every prompt until :meth:`invalidate_completer`
+        is called.
+
+        :return: Completer for commands and shortcuts
+        :rtype: Completer
+        """
+        completer = self._completer
+        if completer is None:
+            completer = self._completer = self._build_completer()
+        return completer
+
+    def invalidate_completer(self) -> None:
+        """Drop the cached completer, so that it is rebuilt for the next prompt.
+
+        Called by :meth:`invalidate_visible_info`, and needed on its own only when the
+        completers of the commands are replaced.
+        """
+        self._completer = None
+
+    def _build_completer(self) -> Completer:
+        cmd_completer_options = {info.name: info.completer for info in self._get_visible_info()}
         shortcut_completers = {
             shortcut: cmd_completer_options[name] for shortcut, name in self.shortcuts.items() if name in cmd_completer_options
         }
@@ -438,16 +602,33 @@ class BaseCmd(object, metaclass=ABCMeta):
     def pexcept(self, *, show_locals: bool = False) -> None:
         self.console.print_exception(show_locals=show_locals)
 
+    def _render_prompt(self) -> Tuple[Any, Any]:
+        """Render the prompt, reusing the result while the same prompt object is set.
+
+        :return: The rendered prompt, and the same wrapped for the prompt session
+        :rtype: Tuple[Any, Any]
+        """
+        prompt = self.prompt
+        cached = self._prompt_cache_val
+        if cached is None or prompt is not self._prompt_cache_key:
+            rendered = self._render_rich_text(prompt)
+            # text without escape sequences is the same as plain text to prompt_toolkit
+            cached = (rendered, ANSI(rendered) if isinstance(rendered, str) and "\x1b" in rendered else rendered)
+            self._prompt_cache_val = cached
+            self._prompt_cache_key = prompt
+        return cached
+
     def _render_rich_text(self, text: Any) -> Any:
-        if not isinstance(text, str) and is_formatted_text(text):
+        if isinstance(text, str):
+            if "[" not in text and ":" not in text:
+                # without markup or emoji codes there is nothing for Rich to render
+                return text
+        elif is_formatted_text(text):
             return text
         with self.console.capture() as capture:
             self.console.print(text, end="")
         return capture.get()
 
-    def _build_command_info(self, cmd: CommandLike) -> CommandInfo:
-        return build_cmd_info(cmd, self)
-
     def __repr__(self) -> str:
         """Return detailed command processor representation."""
         return (
@@ -456,37 +637,51 @@ class BaseCmd(object, metaclass=ABCMeta):
         )
 
     def __init_subclass__(cls, **kwds: Any) -> None:
-        parent_cmd_prefix = [base.COMMAND_FUNC_PREFIX for base in cls.__bases__ if issubclass(base, BaseCmd)]
+        bases = [base for base in cls.__bases__ if issubclass(base, BaseCmd)]
+        parent_cmd_prefix = [base.COMMAND_FUNC_PREFIX for base in bases]
         if not parent_cmd_prefix:  # pragma: no cover
             raise TypeError("This class must subclass from BaseCmd or a subclass of BaseCmd")
         cmd_prefix = parent_cmd_prefix[0]
         if not all(p == cmd_prefix for p in parent_cmd_prefix):
-            base_names = ', '.join(base.__name__ for base in cls.__bases__ if issubclass(base, BaseCmd))
+            base_names = ', '.join(base.__name__ for base in bases)
             raise TypeError(
                 f"All BaseCmd parent classes must have the same COMMAND_FUNC_PREFIX. "
                 f"Conflicting prefixes found in bases: {base_names}"
             )
-        if cmd_prefix != cls.COMMAND_FUNC_PREFIX and cls.__commands__:
-            if cmd_prefix.startswith(cls.COMMAND_FUNC_PREFIX):
-                raise ValueError(
-                    f"Cannot override command prefix: parent prefix {cmd_prefix!r} conflicts with "
-                    f"subclass prefix {cls.COMMAND_FUNC_PREFIX!r}. The parent prefix must not be "
-                    "a prefix of the subclass prefix to avoid command name conflicts."
+        if cmd_prefix != cls.COMMAND_FUNC_PREFIX:
+            if cls.__commands__:
+                if cmd_prefix.startswith(cls.COMMAND_FUNC_PREFIX):
+                    raise ValueError(
+                        f"Cannot override command prefix: parent prefix {cmd_prefix!r} conflicts with "
+                        f"subclass prefix {cls.COMMAND_FUNC_PREFIX!r}. The parent prefix must not be "
+                        "a prefix of the subclass prefix to avoid command name conflicts."
+                    )
+                warnings.warn(
+                    f"Command prefix changed from {cmd_prefix!r} to {cls.COMMAND_FUNC_PREFIX!r}. "
+                    "Existing commands cleared to prevent potential conflicts. Redefine commands "
+                    "using the new prefix.",
+                    RuntimeWarning,
+                    stacklevel=3
                 )
-            warnings.warn(
-                f"Command prefix changed from {cmd_prefix!r} to {cls.COMMAND_FUNC_PREFIX!r}. "
-                "Existing commands cleared to prevent potential conflicts. Redefine commands "
-                "using the new prefix.",
-                RuntimeWarning,
-                stacklevel=3
-            )
             cls.__commands__ = set()
+            # inherited attributes may carry the new prefix, so the whole namespace is scanned
+            names: Iterable[str] = dir(cls)
         else:
+            # commands inherited from BaseCmd bases are taken from them, so only the namespaces of
+            # the class itself and its other bases (e.g. mixins) are scanned; commands found there
+            # replace the inherited ones they override
             cls.__commands__ = set()
-            for base in cls.__bases__:
-                if issubclass(base, BaseCmd):
-                    cls.__commands__.update(base.__commands__)
-        for name in dir(cls):
+            for base in bases:
+                cls.__commands__.update(base.__commands__)
+            scanned: Dict[str, None] = {}
+            for klass in cls.__mro__:
+                if klass is cls or not issubclass(klass, BaseCmd):
+                    scanned.update(dict.fromkeys(name for name in vars(klass) if name.startswith(cmd_prefix)))
+            names = list(scanned)
+            for name in names:
+                for base in bases:
+                    cls.__commands__.discard(getattr(base, name, None))
+        for name in names:
             if not name.startswith(cls.COMMAND_FUNC_PREFIX):
                 continue
             cls.__commands__.add(getattr(cls, name))
@@ -499,8 +694,9 @@ class _TopicAction(_StoreAction):
         cmd = get_cmd_ins(self)
         if cmd is None:  # pragma: no cover
             return
-        help_topics = list(cmd._help_topics().keys()) if isinstance(cmd, Cmd) else []
-        return cmd.get_visible_commands() + help_topics
+        if isinstance(cmd, Cmd):
+            return cmd._get_topic_choices()
+        return cmd.get_visible_commands()
 
     @choices.setter
     def choices(self, _: Any) -> None:
@@ -516,7 +712,7 @@ class Cmd(BaseCmd):
     - Shell command execution
     - Script running capabilities
     """
-    __slots__ = []
+    __slots__ = ["_topic_choices"]
 
     DEFAULT_SHORTCUTS: ClassVar[Dict[str, str]] = {"?": "help", "!": "shell", "@": "run_script"}
 
@@ -526,7 +722,7 @@ class Cmd(BaseCmd):
         stdout: Optional[TextIO] = None,
         *,
         session: Optional[Union[PromptSession, Callable[[Input, Output], PromptSession]]] = None,
-        console: Optional[Console] = None,
+        console: Optional["Console"] = None,
         theme: Optional[Theme] = None,
         prompt: Any = None,
         shortcuts: Optional[Dict[str, str]] = None,
@@ -585,6 +781,7 @@ class Cmd(BaseCmd):
         self.misc_header = misc_header
         self.undoc_header = undoc_header
         self.nohelp = nohelp
+        self._topic_choices: Optional[Tuple[int, List[str]]] = None
 
     @auto_argument(help_category="ptcmd.builtin")
     def do_help(
@@ -613,28 +810,39 @@ class Cmd(BaseCmd):
         :param verbose: If True, show more detailed help (not currently used)
         :type verbose: bool
         """
-        cmds_cats = self._help_topics()
-        cmds_undoc = [
-            info
-            for info in self.get_visible_command_info()
-            if info.help_func is None and info.argparser is None and not info.category and not info.cmd_func.__doc__
-        ]
+        from rich.columns import Columns
+        from rich.console import Group
+        from rich.panel import Panel
+
+        infos = self.get_visible_command_info()
+        # Sort the commands into help topics, documented and undocumented ones in a single pass
+        cmds_cats: Dict[str, List[CommandInfo]] = defaultdict(list)
+        cmds_doc: List[CommandInfo] = []
+        cmds_undoc: List[CommandInfo] = []
+        for info in infos:
+            if info.category is not None:
+                cmds_cats[info.category].append(info)
+            if not info.category:
+                if info.help_func is None and info.argparser is None and not info.cmd_func.__doc__:
+                    cmds_undoc.append(info)
+                else:
+                    cmds_doc.append(info)
         if self.doc_leader:
             self.poutput(self.doc_leader)
+        # The sections are collected and printed at once, so Rich renders and writes them in one go
+        sections: List[Any] = []
         if not cmds_cats:
             # No categories found, fall back to standard behavior
-            self.poutput(
+            sections.append(
                 self._format_help_menu(
                     self.doc_header,
-                    self.get_visible_command_info(),
+                    infos,
                     verbose=verbose,
                     style="cmd.help.doc",
                 )
             )
         else:
             # Categories found, Organize all commands by category
-            cmds_doc = [info for info in self.get_visible_command_info() if not info.category and info not in cmds_undoc]
-
             # Create a list of renderable objects for each category
             category_contents = []
             for category in sorted(cmds_cats.keys()):
@@ -648,15 +856,15 @@ class Cmd(BaseCmd):
             #     category_contents.append(self._get_help_content(self.default_category, cmds_doc, verbose=verbose))
             #     category_contents.append(Text(""))  # Add spacing
 
-            self.poutput(Panel(
+            sections.append(Panel(
                 Columns(category_contents[:-1]),  # Remove the last empty text for better spacing
                 title=self.doc_header,
                 title_align="left",
                 style="cmd.help.doc",
             ))
             if cmds_doc:
-                self.poutput(self._format_help_menu(self.default_category, cmds_doc, verbose=verbose, style="cmd.help.doc"))
-            self.poutput(
+                sections.append(self._format_help_menu(self.default_category, cmds_doc, verbose=verbose, style="cmd.help.doc"))
+            sections.append(
                 Panel(
                     Columns([f"[cmd.help.name]{name}[/cmd.help.name]" for name in cmds_cats]),
                     title=self.misc_header,
@@ -666,12 +874,15 @@ class Cmd(BaseCmd):
             )
 
         if cmds_undoc:
-            self.poutput(self._format_help_menu(self.undoc_header, cmds_undoc, verbose=verbose, style="cmd.help.undoc"))
+            sections.append(self._format_help_menu(self.undoc_header, cmds_undoc, verbose=verbose, style="cmd.help.undoc"))
+        self.poutput(Group(*sections))
 
     def _format_help_menu(
         self, title: str, cmds_info: List[CommandInfo], *, verbose: bool = False, style: Union[str, Style, None] = None
-    ) -> Panel:
-        cmds_info.sort(key=lambda info: info.name)
+    ) -> "Panel":
+        from rich.columns import Columns
+        from rich.panel import Panel
+
         return Panel(
             Columns(
                 [
@@ -706,23 +917,26 @@ class Cmd(BaseCmd):
             else:
                 return cmd_info.argparser.format_usage().rstrip()
         if cmd_info.cmd_func.__doc__ is not None:
+            import pydoc
+
             return pydoc.getdoc(cmd_info.cmd_func)
         else:
             return self.nohelp % (cmd_info.name,)
 
-    def _get_help_content(self, title: str, cmds_info: List[CommandInfo], *, verbose: bool = False) -> Columns:
+    def _get_help_content(self, title: str, cmds_info: List[CommandInfo], *, verbose: bool = False) -> "Columns":
         """Return help content without Panel wrapper.
 
         :param title: The title for the help section
         :type title: str
-        :param cmds_info: List of command info objects
+        :param cmds_info: Command info objects, in the order to show them
         :type cmds_info: List[CommandInfo]
         :param verbose: If True, show more detailed help
         :type verbose: bool
         :return: Columns containing the help content
         :rtype: Columns
         """
-        cmds_info.sort(key=lambda info: info.name)
+        from rich.columns import Columns
+
         return Columns(
             [
                 Text.from_markup(f"[cmd.help.name]{info.name}[/cmd.help.name] - ").append_text(
@@ -734,9 +948,26 @@ class Cmd(BaseCmd):
             ]
         )
 
+    def _get_topic_choices(self) -> List[str]:
+        """Get the commands and help topics accepted by ``help``.
+
+        The same list is returned until the visible commands change, so completion can
+        reuse its tables for it.
+
+        :return: Visible command names followed by help topic names
+        :rtype: List[str]
+        """
+        cached = self._topic_choices
+        if cached is None or cached[0] != self._visible_version:
+            cached = self._topic_choices = (
+                self._visible_version,
+                self.get_visible_commands() + list(self._help_topics()),
+            )
+        return cached[1]
+
     def _help_topics(self) -> Dict[str, List[CommandInfo]]:
         cmds_cats = defaultdict(list)
-        for info in self.get_visible_command_info():
+        for info in self._get_visible_info():
             if info.category is not None:
                 cmds_cats[info.category].append(info)
         return cmds_cats
@@ -1,10 +1,12 @@
 import argparse
+import shlex
+from typing import Any, List
 from unittest.mock import Mock
 
 import pytest
 from prompt_toolkit.document import Document
 
-from ptcmd.completer import ArgparseCompleter
+from ptcmd.completer import _PARSER_INFO_CACHE, ArgparseCompleter, _get_parser_info, _split_line
 
 
 @pytest.fixture
@@ -15,7 +17,7 @@ def simple_parser() -> argparse.ArgumentParser:
     parser.add_argument("-b", "--beta", help="Beta option")
     parser.add_argument("positional", help="A positional argument", choices=["file1", "file2", "file3"])
     parser.add_argument("optional_pos", nargs="?", help="An optional positional argument")
-    parser.add_argument("--choice", choices=["opt1", "opt2", "opt3"])
+    parser.add_argument("--choice", choices=("opt1", "opt2", "opt3"))
     parser.add_argument("--flag", action="store_true")
     parser.add_argument("--level", type=int)
     return parser
@@ -340,3 +342,267 @@ def test_nargs_optional_handling() -> None:
     document = Document(text="--opt ", cursor_position=6)
     completions = list(completer.get_completions(document, Mock()))
     assert len(completions) == 0
+
+def test_parser_tables_built_lazily() -> None:
+    """Test that parser tables are only built once completion is requested."""
+    parser = argparse.ArgumentParser()
+    completer = ArgparseCompleter(parser)
+    assert parser not in _PARSER_INFO_CACHE
+
+    parser.add_argument("--late", help="Added after the completer")
+    document = Document(text="--la", cursor_position=4)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["--late"]
+    assert parser in _PARSER_INFO_CACHE
+
+def test_parser_tables_shared(simple_parser: argparse.ArgumentParser) -> None:
+    """Test that completers of the same parser share the extracted tables."""
+    first = ArgparseCompleter(simple_parser)
+    second = ArgparseCompleter(simple_parser)
+    info = first._info
+    assert second._info is info
+
+    simple_parser.add_argument("--extra")
+    third = ArgparseCompleter(simple_parser)
+    assert third._info is not info
+    assert "--extra" in third._info.flag_specs
+
+def test_nested_subcommand_completion() -> None:
+    """Test completion through several levels of subcommands."""
+    parser = argparse.ArgumentParser(prefix_chars="-")
+    outer = parser.add_subparsers().add_parser("outer", prefix_chars="+")
+    inner = outer.add_subparsers().add_parser("inner")
+    inner.add_argument("--deep", choices=["x", "y"])
+    outer.add_argument("+o")
+    completer = ArgparseCompleter(parser)
+
+    document = Document(text="outer inner --deep ", cursor_position=19)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["x", "y"]
+
+    document = Document(text="outer +", cursor_position=7)
+    completions = list(completer.get_completions(document, Mock()))
+    assert "+o" in [c.text for c in completions]
+
+    document = Document(text="outer missing ", cursor_position=14)
+    assert list(completer.get_completions(document, Mock())) == []
+
+def test_flag_completion_keeps_declaration_order() -> None:
+    """Test that prefix lookups yield flags in the order they were declared."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--zeta")
+    parser.add_argument("--alpha")
+    parser.add_argument("--zed")
+    completer = ArgparseCompleter(parser)
+
+    document = Document(text="--", cursor_position=2)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["--zeta", "--alpha", "--zed"]
+
+    document = Document(text="--ze", cursor_position=4)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["--zeta", "--zed"]
+
+def test_prewalk_state_cached(completer: ArgparseCompleter) -> None:
+    """Test that the parse state of the preceding tokens is reused while typing."""
+    document = Document(text="--choice o", cursor_position=10)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["opt1", "opt2", "opt3"]
+    state = completer._prewalk_cache[("--choice",)]
+
+    document = Document(text="--choice opt", cursor_position=12)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["opt1", "opt2", "opt3"]
+    assert completer._prewalk_cache[("--choice",)] is state
+    assert len(completer._prewalk_cache) == 1
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "cmd", "cmd  arg ", "cmd 'a b' c", 'cmd "a b', "cmd 'a \"b", "a'b c'd", '"ab"cd', "\ta\nb", '"', "a '", "''x"],
+)
+def test_split_line_matches_shlex(text: str) -> None:
+    """Test that the tokenizer matches non-POSIX shlex, closing unclosed quotes."""
+    for quote in ("", '"', "'"):
+        try:
+            expected = shlex.split(text + quote, comments=False, posix=False)
+        except ValueError:
+            continue
+        break
+    assert _split_line(text) == expected
+
+def test_suppressed_flag_not_completed() -> None:
+    """Test that suppressed flags are hidden but still count for abbreviations."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--verbose", help="Verbose output")
+    parser.add_argument("--version-hidden", help=argparse.SUPPRESS)
+    completer = ArgparseCompleter(parser)
+
+    document = Document(text="--ver", cursor_position=5)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [(c.text, c.display_meta_text) for c in completions] == [("--verbose", "Verbose output")]
+
+    # "--ver" is ambiguous, so it does not consume the next token as a value
+    document = Document(text="--ver x --", cursor_position=10)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["--verbose"]
+
+def test_choice_table_tracks_changes() -> None:
+    """Test that stringified choices are reused until the choices change."""
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers()
+    subparsers.add_parser("beta")
+    subparsers.add_parser("alpha")
+    completer = ArgparseCompleter(parser)
+
+    document = Document(text="", cursor_position=0)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["beta", "alpha"]
+
+    subparsers.add_parser("also")
+    document = Document(text="a", cursor_position=1)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["alpha", "also"]
+
+def test_abbreviated_flag_takes_value(completer: ArgparseCompleter) -> None:
+    """Test that a unique flag abbreviation completes the values of its flag."""
+    document = Document(text="--ch ", cursor_position=5)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["opt1", "opt2", "opt3"]
+
+def test_prewalk_state_extended(subcommand_completer: ArgparseCompleter) -> None:
+    """Test that typing a new token extends the cached state of the previous tokens."""
+    line = "cmd2 --cmd2-opt v a "
+    for end in range(1, len(line) + 1):
+        document = Document(text=line[:end], cursor_position=end)
+        list(subcommand_completer.get_completions(document, Mock()))
+    extended = subcommand_completer._prewalk_cache[("cmd2", "--cmd2-opt", "v", "a")][0]
+    fresh = ArgparseCompleter(subcommand_completer._parser)._prewalk(("cmd2", "--cmd2-opt", "v", "a"))
+    assert extended is not None and fresh is not None
+    assert extended.consumed_arg_values == fresh.consumed_arg_values == {"cmd2_opt": ["v"], "cmd2_arg": ["a"]}
+    assert extended.matched_flags == fresh.matched_flags
+    assert extended.pos_index == fresh.pos_index
+    # the state the walk was resumed from is left untouched
+    assert subcommand_completer._prewalk_cache[("cmd2", "--cmd2-opt", "v")][0].consumed_arg_values == {"cmd2_opt": ["v"]}
+
+def test_completion_display_prerendered(completer: ArgparseCompleter) -> None:
+    """Test that completion displays are rendered once and shared between completions."""
+    first = completer.get_completions(Document(text="--choice ", cursor_position=9), Mock())
+    second = completer.get_completions(Document(text="--choice o", cursor_position=10), Mock())
+    assert first[0].display is second[0].display
+    assert first[0].display_text == "opt1"
+    flags = completer.get_completions(Document(text="--al", cursor_position=4), Mock())
+    again = completer.get_completions(Document(text="--a", cursor_position=3), Mock())
+    assert flags[0].display is again[0].display
+    assert flags[0].display_meta is not None
+
+
+def test_result_cache(completer: ArgparseCompleter) -> None:
+    """Test that completions of a repeated text are reused."""
+    document = Document(text="--choice ", cursor_position=9)
+    first = completer.get_completions(document, Mock())
+    assert completer.get_completions(document, Mock()) is first
+    assert [c.text for c in first] == ["opt1", "opt2", "opt3"]
+
+
+def test_result_cache_dynamic_choices() -> None:
+    """Test that completions are recomputed when an action returns new choices."""
+    names = ["one"]
+
+    class DynamicAction(argparse._StoreAction):
+        @property
+        def choices(self) -> List[str]:  # type: ignore[override]
+            return list(names)
+
+        @choices.setter
+        def choices(self, _: Any) -> None:  # type: ignore[override]
+            pass
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("name", action=DynamicAction)
+    completer = ArgparseCompleter(parser)
+    document = Document(text="", cursor_position=0)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["one"]
+    names.append("two")
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["one", "two"]
+
+
+def test_result_cache_choices_mutated() -> None:
+    """Test that completions are recomputed when the choices are changed in place."""
+    hosts = ["alpha"]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", choices=hosts)
+    completer = ArgparseCompleter(parser)
+    document = Document(text="--host ", cursor_position=7)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["alpha"]
+    hosts.append("beta")
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["alpha", "beta"]
+    hosts[0] = "gamma"
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["gamma", "beta"]
+
+
+def test_result_cache_choices_same_length() -> None:
+    """Test that choices computed on iteration are not cached by their length."""
+    names = ["one"]
+
+    class Names:
+        def __len__(self) -> int:
+            return 1
+
+        def __iter__(self) -> Any:
+            return iter(names)
+
+        def __contains__(self, item: Any) -> bool:
+            return item in names
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("name", choices=Names())
+    completer = ArgparseCompleter(parser)
+    document = Document(text="", cursor_position=0)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["one"]
+    names[0] = "two"
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["two"]
+
+
+def test_result_cache_parser_changed() -> None:
+    """Test that completions are recomputed when subcommands or flags are added."""
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers()
+    sub = subparsers.add_parser("first")
+    completer = ArgparseCompleter(parser)
+
+    document = Document(text="", cursor_position=0)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["first"]
+    subparsers.add_parser("second")
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["first", "second"]
+
+    document = Document(text="first --", cursor_position=8)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["--help"]
+    sub.add_argument("--verbose", action="store_true")
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["--help", "--verbose"]
+
+    document = Document(text="--", cursor_position=2)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["--help"]
+    parser.add_argument("--quiet", action="store_true")
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["--help", "--quiet"]
+
+def test_used_choices_not_repeated() -> None:
+    """Test that choices already given to an argument are not offered again."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pick", nargs="+", choices=["a", "b", "c"])
+    completer = ArgparseCompleter(parser)
+    document = Document(text="--pick a c ", cursor_position=11)
+    assert [c.text for c in completer.get_completions(document, Mock())] == ["b"]
+
+def test_subcommand_tables_memoized(subcommand_completer: ArgparseCompleter) -> None:
+    """Test that subcommand tables are remembered on the parent tables."""
+    document = Document(text="cmd1 --", cursor_position=7)
+    completions = list(subcommand_completer.get_completions(document, Mock()))
+    assert "--cmd1-opt" in [c.text for c in completions]
+    parser, info = subcommand_completer._info.subcommand_infos["cmd1"]
+    assert info is _get_parser_info(parser)
+
+    parser.add_argument("--late")
+    completer = ArgparseCompleter(subcommand_completer._parser)
+    document = Document(text="cmd1 --l", cursor_position=8)
+    completions = list(completer.get_completions(document, Mock()))
+    assert [c.text for c in completions] == ["--late"]
@@ -158,3 +158,26 @@ def test_get_arg_completions_edge_cases() -> None:
     completions = list(completer._get_arg_completions("", state, {}, 0))
     assert len(completions) == 3
     assert all(c.text in ["a", "b", "c"] for c in completions)
+
+def test_argument_state_spec_shared() -> None:
+    """Test that the nargs range of an action is shared until the action changes."""
+    parser = argparse.ArgumentParser()
+    action = parser.add_argument("--shared", nargs=2, help="Shared")
+    first = ArgparseCompleter._ArgumentState(action)
+    second = ArgparseCompleter._ArgumentState(action)
+    assert (second.min, second.max) == (first.min, first.max) == (2, 2)
+    assert second.choice_meta is first.choice_meta
+    second.count += 1
+    assert first.count == 0
+
+    action.nargs = "?"
+    third = ArgparseCompleter._ArgumentState(action)
+    assert (third.min, third.max) == (0, 1)
+    action.help = "Changed"
+    assert ArgparseCompleter._ArgumentState(action).choice_meta != third.choice_meta
+
+def test_argument_state_has_no_dict() -> None:
+    """Test that _ArgumentState instances use slots."""
+    parser = argparse.ArgumentParser()
+    state = ArgparseCompleter._ArgumentState(parser.add_argument("--slot"))
+    assert not hasattr(state, "__dict__")
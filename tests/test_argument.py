@@ -7,7 +7,17 @@ from unittest.mock import patch
 import pytest
 from typing_extensions import Annotated
 
-from ptcmd.argument import Arg, Argument, IgnoreArg, build_parser, get_argument, invoke_from_argv, invoke_from_ns, entrypoint
+from ptcmd.argument import (
+    Arg,
+    Argument,
+    IgnoreArg,
+    _get_signature,
+    build_parser,
+    entrypoint,
+    get_argument,
+    invoke_from_argv,
+    invoke_from_ns,
+)
 
 
 def test_argument() -> None:
@@ -57,6 +67,27 @@ def test_build_parser() -> None:
     assert parser.parse_known_args(["/tmp", "foo", "bar"])[0].__dict__ == {"path": Path("/tmp"), "args": ["foo", "bar"]}
 
 
+def test_build_parser_skip_first() -> None:
+    class Example:
+        def method(self, path: Arg[str, Argument(help="Input path")]) -> None: ...
+
+    parser = build_parser(Example.method, skip_first=True)
+    assert parser.parse_args(["/tmp"]).__dict__ == {"path": "/tmp"}
+
+    with pytest.raises(TypeError):
+        build_parser(Example.method)
+
+
+def test_get_signature_cached() -> None:
+    def example(path: str, *, force: bool = False) -> None: ...
+
+    sig = _get_signature(example)
+    assert list(sig.parameters) == ["path", "force"]
+    assert _get_signature(example) is sig
+    # Builtins cannot be weakly referenced and are inspected directly
+    assert list(_get_signature(divmod).parameters) == ["x", "y"]
+
+
 def test_invoke_from_ns() -> None:
     def test_func(arg1: str, *args: str) -> dict:
         return {"arg1": arg1, "args": args}
@@ -1,5 +1,9 @@
 import io
-from typing import Generator
+import shlex
+import sys
+from collections import deque
+from types import ModuleType
+from typing import Any, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -80,6 +84,22 @@ async def test_cmd_queue(base_cmd: BaseCmd) -> None:
     assert base_cmd.cmdqueue == []
 
 
+@pytest.mark.asyncio
+async def test_cmd_queue_default_deque(base_cmd: BaseCmd) -> None:
+    """Test that lines appended to the default command queue are executed in order."""
+    assert isinstance(base_cmd.cmdqueue, deque)
+    base_cmd.cmdqueue.extend(["cmd1", "EOF"])
+    mock_info = MagicMock(spec=CommandInfo)
+    mock_info.name = "cmd1"
+    mock_info.disabled = False
+    mock_info.cmd_func = AsyncMock(return_value=None)
+    base_cmd.command_info = {"cmd1": mock_info}  # type: ignore
+
+    await base_cmd.cmdloop_async()
+    mock_info.cmd_func.assert_called_once_with([])
+    assert not base_cmd.cmdqueue
+
+
 def test_poutput(base_cmd: BaseCmd) -> None:
     """Test output methods."""
     base_cmd.poutput("test message")
@@ -111,6 +131,35 @@ def test_help_system(base_cmd: BaseCmd) -> None:
     assert visible == ["cmd1"]
 
 
+def test_visible_info_cached(base_cmd: BaseCmd) -> None:
+    """Test that visible commands are cached until invalidated."""
+    info = CommandInfo(name="cmd1", cmd_func=MagicMock())
+    base_cmd.command_info = {"cmd1": info}
+    assert base_cmd.get_visible_commands() == ["cmd1"]
+
+    base_cmd.command_info["cmd1"] = info._replace(hidden=True)
+    assert base_cmd.get_visible_commands() == ["cmd1"]
+    base_cmd.invalidate_visible_info()
+    assert base_cmd.get_visible_commands() == []
+    assert base_cmd.get_visible_command_info() == []
+
+
+def test_completer_cached(base_cmd: BaseCmd) -> None:
+    """Test that the completer is reused until the commands change."""
+    completer = base_cmd.completer
+    assert base_cmd.completer is completer
+
+    info = CommandInfo(name="cmd1", cmd_func=MagicMock())
+    base_cmd.command_info = {"cmd1": info}
+    rebuilt = base_cmd.completer
+    assert rebuilt is not completer
+
+    base_cmd.command_info["cmd1"] = info._replace(disabled=True)
+    assert base_cmd.completer is rebuilt
+    base_cmd.invalidate_visible_info()
+    assert base_cmd.completer is not rebuilt
+
+
 def test_init_non_tty() -> None:
     """Test initialization when stdin is not a TTY."""
     # Simulate non-TTY by using a StringIO that returns False for isatty
@@ -123,6 +172,19 @@ def test_init_non_tty() -> None:
     assert cmd.session is None
 
 
+def test_console_created_lazily() -> None:
+    """Test that the default console is only created when first used."""
+    stdout = io.StringIO()
+    cmd = BaseCmd(stdin=io.StringIO(), stdout=stdout)
+    assert cmd._console is None
+    console = cmd.console
+    assert console.file is stdout
+    assert cmd.console is console
+
+    cmd.poutput("hello")
+    assert stdout.getvalue() == "hello\n"
+
+
 @pytest.mark.asyncio
 async def test_emptyline(base_cmd: BaseCmd) -> None:
     """Test empty line input."""
@@ -155,6 +217,22 @@ async def test_default(base_cmd: BaseCmd) -> None:
     assert result is True
 
 
+@pytest.mark.parametrize(
+    "line",
+    ["cmd a b", "  cmd\ta  b ", "cmd a\\b", "cmd a\xa0b\u2003c", 'cmd "a b" c', "cmd 'a b' c", 'cmd a"b c"d'],
+)
+def test_parseline_tokens(base_cmd: BaseCmd, line: str) -> None:
+    """Test that lines with and without quotes are split like non-POSIX shlex."""
+    tokens = shlex.split(line.strip(), comments=False, posix=False)
+    assert base_cmd.parseline(line) == (tokens[0], tokens[1:], line.strip())
+
+
+def test_parseline_unclosed_quote(base_cmd: BaseCmd) -> None:
+    """Test that an unclosed quote is rejected like shlex does."""
+    with pytest.raises(ValueError, match="No closing quotation"):
+        base_cmd.parseline('cmd "a b')
+
+
 def test_parseline_shortcuts(base_cmd: BaseCmd) -> None:
     """Test command line parsing with shortcuts."""
     # Setup shortcuts and mock command info
@@ -176,6 +254,22 @@ def test_parseline_shortcuts(base_cmd: BaseCmd) -> None:
     assert args is None
     assert line == ""
 
+    # Test shortcuts sharing their first character
+    base_cmd.shortcuts = {"??": "help", "?": "shell"}
+    cmd, args, line = base_cmd.parseline("??topic")
+    assert cmd == "help"
+    assert args == ["topic"]
+
+    # The longest shortcut wins regardless of the order they were given in
+    base_cmd.command_info = {"help": mock_info, "shell": mock_info}  # type: ignore
+    base_cmd.shortcuts = {"?": "shell", "??": "help"}
+    cmd, args, line = base_cmd.parseline("??topic")
+    assert cmd == "help"
+    assert args == ["topic"]
+    cmd, args, line = base_cmd.parseline("?topic")
+    assert cmd == "shell"
+    assert args == ["topic"]
+
     # Test invalid shortcut
     base_cmd.shortcuts = {"@": "unknown"}
     cmd, args, line = base_cmd.parseline("@test")
@@ -211,6 +305,28 @@ def test_render_rich_text(base_cmd: BaseCmd) -> None:
     rendered = base_cmd._render_rich_text(text)
     assert rendered == text
 
+    # Markup still goes through Rich
+    assert base_cmd._render_rich_text("[bold]Bold[/bold]") == "Bold"
+
+
+def test_prompt_rendered_once(base_cmd: BaseCmd) -> None:
+    """Test that the prompt is only rendered again after it is replaced."""
+    base_cmd.prompt = "[bold]first[/bold] "
+    with patch.object(BaseCmd, "_render_rich_text", return_value="first ") as mock_render:
+        assert base_cmd.visible_prompt == "first "
+        assert base_cmd.visible_prompt == "first "
+        mock_render.assert_called_once_with("[bold]first[/bold] ")
+    base_cmd.prompt = "[bold]second[/bold] "
+    assert base_cmd.visible_prompt == "second "
+
+
+def test_plain_prompt_not_rendered(base_cmd: BaseCmd) -> None:
+    """Test that a prompt without markup is used without going through Rich."""
+    base_cmd.prompt = "plain> "
+    with patch.object(base_cmd.console, "capture") as mock_capture:
+        assert base_cmd._render_prompt() == ("plain> ", "plain> ")
+        mock_capture.assert_not_called()
+
 
 def test_repr(base_cmd: BaseCmd) -> None:
     """Test string representation."""
@@ -284,6 +400,45 @@ def test_command_collection_with_same_prefix() -> None:
     assert SubCmd.do_test in SubCmd.__commands__
 
 
+def test_command_override_in_subclass() -> None:
+    """Test that a command redefined in a subclass replaces the inherited one."""
+
+    class ParentCmd(BaseCmd):
+        def do_test(self, argv: Any) -> None:
+            pass
+
+        def do_other(self, argv: Any) -> None:
+            pass
+
+    class SubCmd(ParentCmd):
+        def do_test(self, argv: Any) -> None:
+            pass
+
+    assert SubCmd.__commands__ == {SubCmd.do_test, ParentCmd.do_other}
+    assert ParentCmd.__commands__ == {ParentCmd.do_test, ParentCmd.do_other}
+    cmd = SubCmd(stdin=io.StringIO(), stdout=io.StringIO())
+    assert sorted(cmd.command_info) == ["other", "test"]
+
+
+def test_command_from_mixin() -> None:
+    """Test that commands defined on a non-BaseCmd mixin are registered."""
+
+    class Mixin:
+        def do_mix(self, argv: Any) -> None:
+            pass
+
+    class ParentCmd(BaseCmd):
+        def do_test(self, argv: Any) -> None:
+            pass
+
+    class App(Mixin, ParentCmd):
+        pass
+
+    assert App.__commands__ == {Mixin.do_mix, ParentCmd.do_test}
+    cmd = App(stdin=io.StringIO(), stdout=io.StringIO())
+    assert sorted(cmd.command_info) == ["mix", "test"]
+
+
 def test_multiple_inheritance_with_conflicting_prefixes() -> None:
     """Test when subclass inherits from multiple BaseCmd with conflicting prefixes."""
 
@@ -339,3 +494,61 @@ def test_command_collection_with_prefix() -> None:
     assert SubCmd.cmd_test in SubCmd.__commands__
     assert SubCmd.cmd_another in SubCmd.__commands__
     assert SubCmd.not_a_command not in SubCmd.__commands__
+
+
+def test_cmdloop_uses_uvloop_when_available(base_cmd: BaseCmd) -> None:
+    """Test that cmdloop runs on uvloop when it can be imported."""
+    fake_uvloop = ModuleType("uvloop")
+    fake_uvloop.run = MagicMock(side_effect=lambda coro: coro.close())  # type: ignore[attr-defined]
+    with patch.dict(sys.modules, {"uvloop": fake_uvloop}):
+        base_cmd.cmdloop()
+    fake_uvloop.run.assert_called_once()  # type: ignore[attr-defined]
+
+    base_cmd.cmdqueue = ["EOF"]
+    with patch.dict(sys.modules, {"uvloop": None}):
+        base_cmd.cmdloop()
+    assert base_cmd.cmdqueue == []
+
+
+@pytest.mark.asyncio
+async def test_async_hooks(base_cmd: BaseCmd) -> None:
+    """Test that coroutine hooks are awaited by the command loop."""
+    mock_info = MagicMock(spec=CommandInfo)
+    mock_info.name = "cmd1"
+    mock_info.disabled = False
+    mock_info.cmd_func = MagicMock(return_value=None)
+    base_cmd.command_info = {"cmd1": mock_info}  # type: ignore
+    base_cmd.cmdqueue = ["CMD1 arg", "EOF"]
+
+    async def precmd(line: str) -> str:
+        return line.replace("CMD1", "cmd1")
+
+    with patch.object(BaseCmd, "precmd", side_effect=precmd), patch.object(
+        BaseCmd, "postcmd", AsyncMock(side_effect=lambda stop, line: stop)
+    ):
+        await base_cmd.cmdloop_async()
+    mock_info.cmd_func.assert_called_once_with(["arg"])
+
+
+@pytest.mark.asyncio
+async def test_sync_default_and_emptyline() -> None:
+    """Test that synchronous overrides of default and emptyline are called directly."""
+
+    class SyncCmd(BaseCmd):
+        def default(self, line: str) -> bool:  # type: ignore[override]
+            return line == "quit"
+
+        def emptyline(self) -> bool:  # type: ignore[override]
+            return True
+
+    cmd = SyncCmd(stdin=io.StringIO(), stdout=io.StringIO())
+    assert await cmd.onecmd("quit") is True
+    assert await cmd.onecmd("other") is False
+    assert await cmd.onecmd("") is True
+
+
+def test_bash_lexer_shared() -> None:
+    """Test that all prompts share a single command line lexer."""
+    from ptcmd.core import _get_bash_lexer
+
+    assert _get_bash_lexer() is _get_bash_lexer()
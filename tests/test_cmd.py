@@ -114,6 +114,15 @@ async def test_do_shell(cmd: Cmd) -> None:
         await cmd.do_shell([])
         mock_subprocess.assert_called_once_with("", stdin=None, stdout=cmd.stdout, stderr=cmd.stdout)
 
+def test_topic_choices_cached(cmd: Cmd) -> None:
+    """Test that help topic choices are reused until the visible commands change."""
+    choices = cmd._get_topic_choices()
+    assert "help" in choices and "ptcmd.builtin" in choices
+    assert cmd._get_topic_choices() is choices
+
+    cmd.command_info = {"test": CommandInfo(name="test", cmd_func=MagicMock(), category="extra")}
+    assert cmd._get_topic_choices() == ["test", "extra"]
+
 def test_help_menu_categorized(cmd: Cmd) -> None:
     """Test categorized help menu output."""
     # Create command info with categories
@@ -2,7 +2,7 @@ import argparse
 from argparse import _SubParsersAction
 import sys
 from types import MethodType
-from typing import Any, Optional
+from typing import Any, Optional, get_type_hints
 from unittest.mock import MagicMock
 
 import pytest
@@ -42,6 +42,30 @@ def test_command_init() -> None:
     assert cmd.disabled
 
 
+def test_command_wrapper_attributes() -> None:
+    """Test that Command exposes the metadata of the wrapped function."""
+    def do_func(self: Any) -> None:
+        """Func doc"""
+
+    cmd = Command(do_func)
+    assert cmd.__name__ == "do_func"
+    assert cmd.__qualname__ == do_func.__qualname__
+    assert cmd.__module__ == do_func.__module__
+    assert cmd.__doc__ == "Func doc"
+    assert cmd.__wrapped__ is do_func
+
+
+def test_command_type_hints() -> None:
+    """Test that the annotations of the wrapped function are visible on the command."""
+    class TestCmd(Cmd):
+        @auto_argument
+        def do_test(self, name: str, count: int = 1) -> None:
+            pass
+
+    assert TestCmd.do_test.__annotations__ is TestCmd.do_test.__func__.__annotations__
+    assert get_type_hints(TestCmd.do_test) == {"name": str, "count": int, "return": type(None)}
+
+
 def test_command_with_parser() -> None:
     """Test Command with custom parser."""
     def func(self: Any) -> None:
@@ -78,6 +102,18 @@ def test_add_subcommand() -> None:
     # assert sub2.cmd_name == "sub2"
 
 
+def test_repr_parent_chain() -> None:
+    """Test that the repr lists the current names of the parent commands."""
+    def main_func(self: Any) -> None:
+        pass
+
+    main_cmd = Command(main_func)
+    sub = main_cmd.add_subcommand("sub", lambda self: None)
+    assert "parent_chain=['<root>']" in repr(sub)
+    main_cmd.cmd_name = "main"
+    assert "parent_chain=['main']" in repr(sub)
+
+
 def test_invoke_from_argv(base_cmd: BaseCmd) -> None:
     """Test invoking a command from command line arguments."""
     def test_func(self: Any, arg1: str, *, flag: bool = False) -> str:
@@ -97,6 +133,17 @@ def test_invoke_from_argv(base_cmd: BaseCmd) -> None:
     assert result is None
 
 
+def test_invoke_from_argv_quoted(base_cmd: BaseCmd) -> None:
+    """Test that quoted tokens are unquoted before parsing."""
+    def test_func(self: Any, arg1: str, arg2: str) -> str:
+        return f"{arg1}|{arg2}"
+
+    cmd_obj = Command(test_func)
+    assert cmd_obj.invoke_from_argv(base_cmd, ['"hello world"', "plain"]) == "hello world|plain"
+    assert cmd_obj.invoke_from_argv(base_cmd, ["plain", "'single'"]) == "plain|single"
+    assert cmd_obj.invoke_from_argv(base_cmd, ["it's", 'say"']) == "it's|say\""
+
+
 def test_invoke_from_ns(base_cmd: BaseCmd) -> None:
     """Test invoking a command from a namespace."""
     def test_func(self: Any, arg1: str, flag: bool = False) -> str:
@@ -111,6 +158,41 @@ def test_invoke_from_ns(base_cmd: BaseCmd) -> None:
     assert result == "arg1=test_value, flag=True"
 
 
+def test_invoke_from_ns_var_positional(base_cmd: BaseCmd) -> None:
+    """Test invoking a command with variadic and keyword-only parameters."""
+    def test_func(self: Any, first: str, *rest: str, flag: bool = False) -> str:
+        return f"first={first}, rest={rest}, flag={flag}"
+
+    cmd_obj = Command(test_func)
+    ns = argparse.Namespace(first="a", rest=["b", "c"], flag=True)
+    ns.__cmd_ins__ = cmd_obj
+
+    result = cmd_obj.invoke_from_ns(base_cmd, ns)
+    assert result == "first=a, rest=('b', 'c'), flag=True"
+
+
+def test_invoke_from_ns_chain_order(base_cmd: BaseCmd) -> None:
+    """Test that a command chain runs from the root down to the subcommand."""
+    calls = []
+
+    def main_func(self: Any) -> str:
+        calls.append("main")
+        return "main-result"
+
+    main_cmd = Command(main_func)
+
+    @main_cmd.add_subcommand("sub")
+    def sub_func(self: Any) -> str:
+        calls.append("sub")
+        return "sub-result"
+
+    ns = main_cmd.parser.parse_args(["sub"])
+    assert main_cmd.invoke_from_ns(base_cmd, ns) == "sub-result"
+    assert calls == ["main", "sub"]
+    assert ns.__cmd_chain__ == (sub_func, main_cmd)
+    assert ns.__cmd_result__ == "main-result"
+
+
 def test_descriptor_protocol() -> None:
     """Test the descriptor protocol (__get__ method)."""
     assert isinstance(Cmd.do_help, Command)
@@ -202,6 +284,12 @@ def test_auto_argument_with_parameters() -> None:
     assert do_test.disabled
 
 
+def test_auto_argument_duplicate_name() -> None:
+    """Test that a command name given both positionally and by keyword is rejected."""
+    with pytest.raises(TypeError, match="cmd_name"):
+        auto_argument("first", cmd_name="second")
+
+
 def test_auto_argument_with_custom_parser() -> None:
     """Test auto_argument with a custom parser."""
     parser = argparse.ArgumentParser()
@@ -286,6 +374,21 @@ def test_ensure_subparsers_with_existing() -> None:
     assert action1 is action2
 
 
+def test_ensure_subparsers_with_custom_parser() -> None:
+    """Test _ensure_subparsers reuses subparsers declared on a custom parser."""
+    def func(self: Any) -> None:
+        pass
+
+    parser = argparse.ArgumentParser()
+    existing = parser.add_subparsers()
+    cmd = Command(func, parser=parser)
+
+    assert cmd._ensure_subparsers() is existing
+    cmd.add_subcommand("sub1", func)
+    cmd.add_subcommand("sub2", func)
+    assert set(existing.choices) == {"sub1", "sub2"}
+
+
 def test_completer_getter(base_cmd: BaseCmd) -> None:
     """Test custom completer getter assignment."""
     def func(self: Any) -> None:
@@ -1,10 +1,11 @@
+import argparse
 from typing import Any, List
 from unittest import mock
 
 import pytest
 
 from ptcmd import Cmd
-from ptcmd.info import CommandInfo, build_cmd_info
+from ptcmd.info import CommandInfo, bind_parser, build_cmd_info, get_cmd_ins
 
 
 @pytest.fixture
@@ -33,3 +34,30 @@ def test_build_cmd_info(app: Cmd) -> None:
     assert info.name == "test"
     assert info.cmd_func([]) is None
     assert info.help_func is None
+
+
+def test_build_cmd_info_help_func() -> None:
+    class App(Cmd):
+        def help_test(self, verbose: bool) -> str:
+            return "Test help"
+
+    def do_test(self: Any, argv: List[str]) -> None:
+        pass
+
+    info = build_cmd_info(do_test, App())
+    assert info.help_func is not None
+    assert info.help_func(False) == "Test help"
+
+
+def test_bind_parser_copies(app: Cmd) -> None:
+    parser = argparse.ArgumentParser(prog="orig")
+    parser.add_argument("--flag")
+
+    bound = bind_parser(parser, "test", app)
+    assert bound is not parser
+    assert bound.prog == "test"
+    assert parser.prog == "orig"
+    assert get_cmd_ins(bound) is app
+    assert get_cmd_ins(parser) is None
+    assert all(a is not b for a, b in zip(bound._actions, parser._actions))
+    assert [a.dest for a in bound._actions] == [a.dest for a in parser._actions]